@@ -0,0 +1,247 @@
+import logging
+import re
+from array import array
+from collections import deque, namedtuple
+
+log = logging.getLogger(__name__)
+
+# Règles par défaut d'un serveur
+DEFAULT_RULES = {
+    "words": [],
+    "regex": [],
+    "rate": [5, 5.0],        # au plus 5 messages en 5 secondes
+    "duplicates": 3,         # 3 messages identiques d'affilée
+    "escalation": [3, 600.0],  # une 4e infraction en 10 minutes => mute
+    "mute_duration": "10m",
+}
+
+Verdict = namedtuple("Verdict", "reason action")
+
+# Un « mot » au sens de l'automod : lettres et chiffres uniquement
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+# ------------------ AHO-CORASICK ------------------
+# Automate multi-motifs : tous les mots interdits sont cherchés en un seul
+# passage sur le message, quel que soit leur nombre.
+class AhoCorasick:
+    def __init__(self, words):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]
+        for word in words:
+            self._add(word)
+        self._link()
+
+    def _add(self, word):
+        state = 0
+        for ch in word:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(())
+            state = nxt
+        self.out[state] = (word,)
+
+    def _link(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find_word(self, text):
+        # Premier mot trouvé en tant que mot entier (pas au milieu d'un autre mot)
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for word in out[state]:
+                    start = i - len(word) + 1
+                    if (start == 0 or not text[start - 1].isalnum()) and (i + 1 == len(text) or not text[i + 1].isalnum()):
+                        return word
+        return None
+
+
+# ------------------ RÈGLES COMPILÉES ------------------
+# Les mots simples sont cherchés par intersection d'ensembles sur les tokens du
+# message (fait en C) ; l'automate ne sert qu'aux expressions contenant espaces
+# ou ponctuation, qu'un découpage en tokens ne peut pas trouver.
+class RuleMatcher:
+    def __init__(self, words, patterns):
+        words = {w.lower().strip() for w in words if w.strip()}
+        self.tokens = frozenset(w for w in words if TOKEN_RE.fullmatch(w))
+        phrases = words - self.tokens
+        self.automaton = AhoCorasick(sorted(phrases)) if phrases else None
+        self.regex, self.singles = compile_patterns(patterns)
+
+    def match(self, text):
+        lowered = text.lower()
+        if self.tokens:
+            hits = self.tokens.intersection(TOKEN_RE.findall(lowered))
+            if hits:
+                return f"mot interdit « {min(hits)} »"
+        if self.automaton is not None:
+            word = self.automaton.find_word(lowered)
+            if word:
+                return f"mot interdit « {word} »"
+        if self.regex is not None and self.regex.search(text):
+            return "motif interdit"
+        if any(regex.search(text) for regex in self.singles):
+            return "motif interdit"
+        return None
+
+
+def mergeable(pattern):
+    # Une alternance renumérote les groupes (\1 viserait le groupe d'un autre
+    # motif) et refuse les drapeaux globaux comme (?i) hors du début
+    try:
+        re.compile(f"(?:{pattern})")
+        return re.compile(pattern).groups == 0
+    except re.error:
+        return False
+
+
+def compile_patterns(patterns):
+    # Les regex sans groupe sont fusionnées en une seule alternance (un seul
+    # scan) ; les autres sont testées une à une. Lève re.error si un motif est
+    # invalide.
+    merged = [p for p in patterns if mergeable(p)]
+    singles = [re.compile(p, re.IGNORECASE) for p in patterns if p not in merged]
+    regex = re.compile("|".join(f"(?:{p})" for p in merged), re.IGNORECASE) if merged else None
+    return regex, singles
+
+
+def validate_regex(pattern):
+    try:
+        re.compile(pattern, re.IGNORECASE)
+        return True
+    except re.error:
+        return False
+
+
+def validate_patterns(patterns):
+    # Vérifie la liste telle qu'elle sera compilée par RuleMatcher
+    try:
+        compile_patterns(patterns)
+        return True
+    except re.error:
+        return False
+
+
+# ------------------ FENÊTRES PAR UTILISATEUR ------------------
+# Tampons circulaires de taille fixe : horodatages des derniers messages,
+# empreintes des derniers contenus et horodatages des dernières infractions.
+class UserWindow:
+    __slots__ = ("times", "hashes", "strikes", "t", "h", "s", "last")
+
+    def __init__(self, rate_count, dup_count, strike_count):
+        self.times = array("d", [float("-inf")] * rate_count)
+        self.hashes = array("q", [0] * dup_count)
+        self.strikes = array("d", [float("-inf")] * strike_count)
+        self.t = self.h = self.s = 0
+        self.last = 0.0
+
+    def sized(self, rate_count, dup_count, strike_count):
+        return len(self.times) == rate_count and len(self.hashes) == dup_count and len(self.strikes) == strike_count
+
+    def push_time(self, now, window):
+        # La case écrasée contient le message d'il y a `rate_count` messages :
+        # s'il est encore dans la fenêtre, la limite est dépassée.
+        oldest = self.times[self.t]
+        self.times[self.t] = now
+        self.t = (self.t + 1) % len(self.times)
+        self.last = now
+        return now - oldest < window
+
+    def push_hash(self, value):
+        self.hashes[self.h] = value
+        self.h = (self.h + 1) % len(self.hashes)
+        return all(x == value for x in self.hashes)
+
+    def push_strike(self, now, window):
+        oldest = self.strikes[self.s]
+        self.strikes[self.s] = now
+        self.s = (self.s + 1) % len(self.strikes)
+        return now - oldest < window
+
+
+# ------------------ MOTEUR ------------------
+class AutoMod:
+    def __init__(self, rules_for, prune_every=10000):
+        # rules_for(guild_id) -> dict des règles du serveur (ou None)
+        self.rules_for = rules_for
+        self.matchers = {}
+        self.windows = {}
+        self.prune_every = prune_every
+        self._seen = 0
+
+    def invalidate(self, guild_id):
+        self.matchers.pop(guild_id, None)
+        for key in [k for k in self.windows if k[0] == guild_id]:
+            del self.windows[key]
+
+    def _compiled(self, guild_id):
+        # (règles complétées, automate) : recompilés seulement après invalidate()
+        compiled = self.matchers.get(guild_id)
+        if compiled is None:
+            rules = self.rules_for(guild_id)
+            if rules:
+                rules = {**DEFAULT_RULES, **rules}
+                try:
+                    matcher = RuleMatcher(rules["words"], rules["regex"])
+                except re.error:
+                    # Motif invalide enregistré avant validation : l'automod
+                    # continue sans les regex plutôt que d'échouer à chaque message
+                    log.exception("Regex d'automod invalides sur le serveur %s", guild_id)
+                    matcher = RuleMatcher(rules["words"], ())
+                compiled = (rules, matcher)
+            else:
+                compiled = (None, None)
+            self.matchers[guild_id] = compiled
+        return compiled
+
+    def rules(self, guild_id):
+        return self._compiled(guild_id)[0]
+
+    def check(self, guild_id, user_id, content, now):
+        rules, matcher = self._compiled(guild_id)
+        if rules is None:
+            return None
+        rate_count, rate_window = rules["rate"]
+        strike_count, strike_window = rules["escalation"]
+        key = (guild_id, user_id)
+        window = self.windows.get(key)
+        if window is None or not window.sized(rate_count, rules["duplicates"], strike_count):
+            window = self.windows[key] = UserWindow(rate_count, rules["duplicates"], strike_count)
+
+        self._seen += 1
+        if self._seen % self.prune_every == 0:
+            self.prune(now, max(rate_window, strike_window))
+
+        reason = matcher.match(content)
+        if reason is None and window.push_time(now, rate_window):
+            reason = "envoi de messages trop rapide"
+        if reason is None and content and window.push_hash(hash(content)):
+            reason = "messages répétés"
+        if reason is None:
+            return None
+        action = "mute" if window.push_strike(now, strike_window) else "warn"
+        return Verdict(reason, action)
+
+    def prune(self, now, max_window):
+        # Oublie les utilisateurs inactifs pour garder une mémoire bornée
+        stale = [k for k, w in self.windows.items() if now - w.last > max_window]
+        for key in stale:
+            del self.windows[key]
@@ -0,0 +1,272 @@
+# Benchmark de bout en bout : les vrais handlers de ModeratorBot (discord.py
+# compris) contre un faux Discord local qui simule latence et rate limits.
+# Aucune connexion à Discord : tout tourne en local, dans un dossier temporaire.
+# Usage : python benchmarks/bench_bot.py [--latency 0.03] [--limit 50] [--window 1.0]
+#         [--rate-limit-chance 0.0] [--scenarios ticket_rush,close_ticket,...]
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+import metrics
+from fake_discord import FakeDiscord, Mention, ChannelOption, BOT_ID, API
+
+SCENARIOS = ("ticket_rush", "close_ticket", "ban", "mute", "purge", "poll", "poll_vote", "raid_ban", "staff_log")
+MESSAGE_EDIT = f"PATCH {API}/channels/{{channel_id}}/messages/{{message_id}}"
+
+
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+# ------------------ MONDE SIMULÉ ------------------
+class World:
+    def __init__(self, fake: FakeDiscord, members=1000, purge_channels=20, purge_messages=100):
+        self.fake = fake
+        self.guild = fake.add_guild("Bench")
+        bot_role = fake.add_role(self.guild, "Bot", str(2 ** 41 - 1))
+        fake.roles[bot_role]["position"] = 10
+        staff_role = fake.add_role(self.guild, "Staff", str(2 ** 41 - 1))
+        fake.roles[staff_role]["position"] = 5
+        fake.add_role(self.guild, "Muted")
+        fake.members[self.guild][BOT_ID]["roles"] = [str(bot_role)]
+        self.staff = fake.add_user("staff")
+        fake.add_member(self.guild, self.staff, roles=[staff_role])
+        self.members = []
+        for i in range(members):
+            user_id = fake.add_user(f"membre{i}")
+            fake.add_member(self.guild, user_id)
+            self.members.append(user_id)
+        self.general = fake.add_channel(self.guild, "general")
+        self.staff_logs = fake.add_channel(self.guild, "staff-logs")
+        self.category = fake.add_channel(self.guild, "tickets", type=4)
+        self.ticket_channel = fake.add_channel(self.guild, "ouvrir-un-ticket")
+        self.ticket_message = fake.add_message(self.ticket_channel, BOT_ID, components=[
+            {"type": 1, "components": [{"type": 2, "style": 3, "label": "Ouvrir un ticket", "custom_id": "ticket:open"}]}])
+        self.purge_channels = []
+        for i in range(purge_channels):
+            channel_id = fake.add_channel(self.guild, f"spam-{i}")
+            for _ in range(purge_messages):
+                fake.add_message(channel_id, self.members[0], "spam")
+            self.purge_channels.append(channel_id)
+
+    def config(self):
+        tickets = {"salon": self.ticket_channel, "titre": "Tickets", "description": "Ouvrez un ticket", "bouton": "Ouvrir un ticket",
+                   "logs": self.staff_logs, "category": self.category, "message": int(self.ticket_message["id"])}
+        return {str(self.guild): {"tickets": tickets}}
+
+
+# ------------------ MESURE ------------------
+class Scenario:
+    # Envoie `count` interactions et attend la fin des handlers `handler`
+    def __init__(self, name, handler, count):
+        self.name = name
+        self.handler = handler
+        self.count = count
+        self.durations = []
+        self.finished = asyncio.Event()
+
+    def listener(self, timing):
+        if timing.handler == self.handler:
+            self.durations.append(time.perf_counter() - timing.start)
+            if len(self.durations) >= self.count:
+                self.finished.set()
+
+    async def run(self, fake, send, timeout=600):
+        metrics.listeners.append(self.listener)
+        requests, limited = sum(fake.requests.values()), fake.rate_limited
+        start = time.perf_counter()
+        try:
+            futures = [await send(i) for i in range(self.count)]
+            responses = await asyncio.wait_for(asyncio.gather(*futures), timeout)
+            await asyncio.wait_for(self.finished.wait(), timeout)
+        finally:
+            metrics.listeners.remove(self.listener)
+        elapsed = time.perf_counter() - start
+        first = [delay for delay, _ in responses]
+        return {
+            "scenario": self.name, "ops": self.count, "ops/s": self.count / elapsed,
+            "first p50": percentile(first, 0.5), "first p99": percentile(first, 0.99),
+            "total p50": percentile(self.durations, 0.5), "total p99": percentile(self.durations, 0.99),
+            "requests": sum(fake.requests.values()) - requests, "429": fake.rate_limited - limited,
+        }, responses
+
+
+# ------------------ SCÉNARIOS ------------------
+async def ticket_rush(bot, fake, world):
+    # 200 membres cliquent en même temps sur « Ouvrir un ticket »
+    users = world.members[:200]
+    result, _ = await Scenario("ticket_rush", "TicketButton.open_ticket", len(users)).run(
+        fake, lambda i: fake.button(world.guild, world.ticket_channel, users[i], world.ticket_message, "ticket:open"))
+    return result
+
+
+async def close_ticket(bot, fake, world):
+    channels = [c for c, data in fake.channels.items() if data["name"].startswith("ticket-")]
+    if not channels:
+        await ticket_rush(bot, fake, world)
+        channels = [c for c, data in fake.channels.items() if data["name"].startswith("ticket-")]
+    result, _ = await Scenario("close_ticket", "/close_ticket", len(channels)).run(
+        fake, lambda i: fake.command(world.guild, channels[i], world.staff, "close_ticket"))
+    return result
+
+
+async def ban(bot, fake, world, count=200):
+    targets = world.members[200:200 + count]
+    result, _ = await Scenario("ban", "/ban", len(targets)).run(
+        fake, lambda i: fake.command(world.guild, world.general, world.staff, "ban", user=Mention(targets[i]), raison="bench"))
+    return result
+
+
+async def mute(bot, fake, world, count=200):
+    targets = world.members[:count]
+    result, _ = await Scenario("mute", "/mute", len(targets)).run(
+        fake, lambda i: fake.command(world.guild, world.general, world.staff, "mute", user=Mention(targets[i]), temps="10m"))
+    return result
+
+
+async def purge(bot, fake, world):
+    channels = world.purge_channels
+    result, _ = await Scenario("purge", "/purge", len(channels)).run(
+        fake, lambda i: fake.command(world.guild, channels[i], world.staff, "purge", nombre=100))
+    return result
+
+
+async def open_poll_modals(fake, world, count):
+    modals = []
+    for _ in range(count):
+        future = await fake.command(world.guild, world.general, world.staff, "poll", salon=ChannelOption(world.general))
+        modals.append((await future)[1]["data"])
+    return modals
+
+
+async def poll(bot, fake, world, count=50):
+    # /poll ouvre un modal : on mesure la soumission du modal (envoi du sondage)
+    modals = await open_poll_modals(fake, world, count)
+    result, _ = await Scenario("poll", "PollModal", count).run(
+        fake, lambda i: fake.modal_submit(world.guild, world.general, world.staff, modals[i], ["Sondage", "Pizza ou pâtes ?", "Pizza | Pâtes | Les deux"]))
+    return result
+
+
+async def poll_vote(bot, fake, world, voters=1000, changes=200):
+    # 1000 membres votent sur un même sondage, puis 200 changent d'avis ;
+    # edits = éditions du message du sondage pendant le scénario
+    modals = await open_poll_modals(fake, world, 1)
+    await (await fake.modal_submit(world.guild, world.general, world.staff, modals[0], ["Vote", "Pizza ou pâtes ?", "Pizza | Pâtes | Les deux"]))
+    message = next(m for m in reversed(fake.messages[world.general].values())
+                   if m["components"] and m["components"][0]["components"][0]["custom_id"].startswith("poll:"))
+    poll_id = message["components"][0]["components"][0]["custom_id"].split(":")[1]
+    # Membres encore présents : les scénarios précédents en ont banni
+    present = [m for m in world.members if m in fake.members[world.guild]]
+    users = present[:voters] + present[:changes]
+    edits = fake.requests[MESSAGE_EDIT]
+    result, _ = await Scenario("poll_vote", "PollButton", len(users)).run(
+        fake, lambda i: fake.button(world.guild, world.general, users[i], message, f"poll:{poll_id}:{(i // voters + i) % 3}"))
+    result["edits"] = fake.requests[MESSAGE_EDIT] - edits
+    return result
+
+
+async def raid_ban(bot, fake, world, count=500):
+    # Une seule commande /raid sur 500 comptes ; ops = comptes bannis
+    targets = [m for m in world.members[400:] if m in fake.members[world.guild]][:count]
+    ids = " ".join(str(t) for t in targets)
+    result, _ = await Scenario("raid_ban", "/raid", 1).run(
+        fake, lambda i: fake.command(world.guild, world.general, world.staff, "raid", action="ban", ids=ids, raison="bench"))
+    result["ops/s"] *= len(targets)
+    result["ops"] = len(targets)
+    return result
+
+
+async def staff_log(bot, fake, world, count=200):
+    # send_staff_log n'attend jamais Discord : on mesure jusqu'à la file vide
+    # (200 entrées = la capacité de la file, rien n'est abandonné)
+    import core
+    guild = bot.get_guild(world.guild)
+    requests, limited = sum(fake.requests.values()), fake.rate_limited
+    start = time.perf_counter()
+    for i in range(count):
+        await core.send_staff_log(guild, "Bench", f"Entrée {i}")
+    enqueued = time.perf_counter() - start
+    queue = core.staff_log_queue
+    while queue.depth() or any(not t.done() for t in queue.tasks.values()):
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    return {"scenario": "staff_log", "ops": count, "ops/s": count / elapsed, "first p50": enqueued / count, "first p99": float("nan"),
+            "total p50": float("nan"), "total p99": float("nan"), "requests": sum(fake.requests.values()) - requests, "429": fake.rate_limited - limited}
+
+
+# ------------------ LANCEMENT ------------------
+async def boot(fake, world):
+    # Le module est importé dans le dossier temporaire : ses fichiers y sont créés
+    with open("guilds_config.json", "w", encoding="utf-8") as f:
+        json.dump(world.config(), f)
+    os.environ.update(DISCORD_TOKEN="bench", HEALTH_HOST="127.0.0.1", HEALTH_PORT="0", METRICS_PORT="0")
+    import ModeratorBot
+    fake.install()
+    task = asyncio.create_task(ModeratorBot.main())
+    await asyncio.wait_for(ModeratorBot.bot.wait_until_ready(), 30)
+    # Les extensions se chargent en tâche de fond : on attend qu'elles soient prêtes
+    while not ModeratorBot.loader.ready():
+        await asyncio.sleep(0.05)
+    # main() active les logs INFO de discord.py : seuls les avertissements restent
+    logging.getLogger().setLevel(logging.WARNING)
+    return ModeratorBot.bot, task
+
+
+def print_results(results):
+    columns = ("scenario", "ops", "ops/s", "first p50", "first p99", "total p50", "total p99", "requests", "429", "edits")
+    print(" ".join(f"{c:>12}" for c in columns))
+    for row in results:
+        cells = []
+        for c in columns:
+            value = row.get(c, "-")
+            if c.startswith(("first", "total")):
+                cells.append(f"{value * 1000:>10.1f}ms")
+            elif isinstance(value, float):
+                cells.append(f"{value:>12.1f}")
+            else:
+                cells.append(f"{value:>12}")
+        print(" ".join(cells))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne de ModeratorBot")
+    parser.add_argument("--latency", type=float, default=0.03, help="latence REST simulée (s)")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--limit", type=int, default=50, help="requêtes par bucket et par fenêtre")
+    parser.add_argument("--window", type=float, default=1.0, help="durée d'une fenêtre de rate limit (s)")
+    parser.add_argument("--rate-limit-chance", type=float, default=0.0, help="probabilité d'un 429 imprévu")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    args = parser.parse_args()
+
+    fake = await FakeDiscord(args.latency, args.jitter, args.limit, args.window, args.rate_limit_chance).start()
+    world = World(fake)
+    workdir = tempfile.mkdtemp(prefix="bench-bot-")
+    os.chdir(workdir)
+    bot, task = await boot(fake, world)
+    results = []
+    try:
+        for name in args.scenarios.split(","):
+            results.append(await globals()[name](bot, fake, world))
+            # Laisse les tâches de fond (staff logs, archivage) se terminer entre deux scénarios
+            await asyncio.sleep(2)
+    finally:
+        await bot.close()
+        await task
+        await fake.close()
+    print(f"Latence {args.latency * 1000:.0f} ms ± {args.jitter * 1000:.0f} ms, buckets {args.limit}/{args.window:g}s, dossier {workdir}")
+    print_results(results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
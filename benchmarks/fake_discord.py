@@ -0,0 +1,498 @@
+# Faux serveur Discord (REST + gateway) pour les benchmarks hors ligne.
+# Le bot s'y connecte comme à Discord : discord.py est simplement pointé vers
+# http://127.0.0.1:<port>. Chaque requête REST subit une latence simulée et
+# passe par des buckets de rate limit (en-têtes X-RateLimit-* et réponses 429
+# identiques à celles de Discord).
+import asyncio
+import itertools
+import json
+import random
+import time
+import zlib
+from collections import defaultdict
+import discord
+import yarl
+from aiohttp import web, WSMsgType
+
+API = "/api/v10"
+BOT_ID = 1000
+APPLICATION_ID = 1000
+ADMIN = str(discord.Permissions.all().value)
+# large_threshold envoyé par discord.py dans IDENTIFY
+LARGE_THRESHOLD = 250
+
+
+def json_response(data, status=200, headers=None):
+    # discord.py n'accepte le JSON que si le Content-Type est exactement application/json
+    return web.Response(body=json.dumps(data).encode(), status=status, headers={**(headers or {}), "Content-Type": "application/json"})
+
+
+def iso(ts=None):
+    return discord.utils.utcnow().isoformat() if ts is None else ts
+
+
+# ------------------ BUCKETS DE RATE LIMIT ------------------
+class Bucket:
+    __slots__ = ("name", "remaining", "reset_at")
+
+    def __init__(self, name):
+        self.name = name
+        self.remaining = 0
+        self.reset_at = 0.0
+
+
+class FakeDiscord:
+    def __init__(self, latency=0.03, jitter=0.01, limit=50, window=1.0, rate_limit_chance=0.0, seed=1):
+        # latency/jitter : délai (s) de chaque requête REST ; limit/window : taille des buckets
+        # rate_limit_chance : probabilité d'un 429 imprévu (comme les limites partagées de Discord)
+        self.latency = latency
+        self.jitter = jitter
+        self.limit = limit
+        self.window = window
+        self.rate_limit_chance = rate_limit_chance
+        self.random = random.Random(seed)
+        self.buckets = {}
+        self.requests = defaultdict(int)
+        self.rate_limited = 0
+        self._ids = itertools.count(1)
+        self.users, self.roles, self.channels, self.messages = {}, {}, {}, defaultdict(dict)
+        self.guilds, self.members, self.bans = {}, defaultdict(dict), defaultdict(set)
+        self.sockets = []
+        self.callbacks = {}
+        self.sent_at = {}
+        self.runner = None
+        self.port = None
+        self.users[BOT_ID] = self.user_payload(BOT_ID, "ModeratorBot", bot=True)
+
+    # ---- Identifiants ----
+    def snowflake(self):
+        # Horodaté maintenant : les messages créés sont « récents » pour bulk-delete
+        return discord.utils.time_snowflake(discord.utils.utcnow()) + next(self._ids) % 4096
+
+    # ---- Monde simulé ----
+    def user_payload(self, user_id, name, bot=False):
+        return {"id": str(user_id), "username": name, "global_name": None, "discriminator": "0", "avatar": None, "bot": bot}
+
+    def add_user(self, name):
+        user_id = self.snowflake()
+        self.users[user_id] = self.user_payload(user_id, name)
+        return user_id
+
+    def add_guild(self, name="Bench"):
+        guild_id = self.snowflake()
+        self.guilds[guild_id] = {"id": str(guild_id), "name": name, "owner_id": str(BOT_ID)}
+        self.roles[guild_id] = {"id": str(guild_id), "name": "@everyone", "permissions": "1024", "position": 0, "color": 0,
+                                "hoist": False, "managed": False, "mentionable": False, "flags": 0, "guild_id": guild_id}
+        self.add_member(guild_id, BOT_ID, roles=())
+        return guild_id
+
+    def add_role(self, guild_id, name, permissions="0"):
+        role_id = self.snowflake()
+        self.roles[role_id] = {"id": str(role_id), "name": name, "permissions": permissions, "position": 1, "color": 0,
+                               "hoist": False, "managed": False, "mentionable": False, "flags": 0, "guild_id": guild_id}
+        return role_id
+
+    def add_channel(self, guild_id, name, type=0, parent_id=None, overwrites=()):
+        channel_id = self.snowflake()
+        self.channels[channel_id] = {"id": str(channel_id), "type": type, "guild_id": str(guild_id), "name": name, "position": len(self.channels),
+                                     "parent_id": str(parent_id) if parent_id else None, "permission_overwrites": list(overwrites),
+                                     "nsfw": False, "topic": None, "rate_limit_per_user": 0, "last_message_id": None}
+        return channel_id
+
+    def add_member(self, guild_id, user_id, roles=(), joined_at=None):
+        self.members[guild_id][user_id] = {"user": self.users[user_id], "roles": [str(r) for r in roles], "joined_at": iso(joined_at),
+                                           "deaf": False, "mute": False, "flags": 0, "nick": None}
+
+    def add_message(self, channel_id, author_id, content="", components=()):
+        message_id = self.snowflake()
+        channel = self.channels[channel_id]
+        self.messages[channel_id][message_id] = {
+            "id": str(message_id), "channel_id": str(channel_id), "guild_id": channel["guild_id"], "author": self.users[author_id],
+            "content": content, "timestamp": iso(), "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [],
+            "mention_roles": [], "attachments": [], "embeds": [], "pinned": False, "type": 0, "components": list(components),
+        }
+        return self.messages[channel_id][message_id]
+
+    def guild_payload(self, guild_id):
+        roles = [r for r in self.roles.values() if r["guild_id"] == guild_id]
+        members = list(self.members[guild_id].values())
+        # Comme Discord : au-delà de LARGE_THRESHOLD membres, seul le bot est envoyé
+        # et le reste s'obtient par chunk (op 8)
+        large = len(members) > LARGE_THRESHOLD
+        return {
+            **self.guilds[guild_id], "icon": None, "roles": [{k: v for k, v in r.items() if k != "guild_id"} for r in roles],
+            "channels": [c for c in self.channels.values() if c["guild_id"] == str(guild_id)],
+            "members": [self.members[guild_id][BOT_ID]] if large else members,
+            "member_count": len(members), "large": large, "unavailable": False, "emojis": [], "stickers": [], "features": [],
+            "presences": [], "voice_states": [], "threads": [], "stage_instances": [], "guild_scheduled_events": [],
+            "premium_tier": 0, "verification_level": 0, "default_message_notifications": 0, "explicit_content_filter": 0,
+            "mfa_level": 0, "nsfw_level": 0, "preferred_locale": "fr", "system_channel_flags": 0, "afk_timeout": 300,
+        }
+
+    # ---- Serveur ----
+    async def start(self):
+        app = web.Application(middlewares=[self.simulate])
+        route = app.router.add_route
+        route("GET", "/gateway", self.gateway)
+        route("GET", API + "/gateway/bot", self.gateway_bot)
+        route("GET", API + "/users/@me", self.me)
+        route("GET", API + "/oauth2/applications/@me", self.application)
+        route("PUT", API + "/applications/{application_id}/commands", self.sync_commands)
+        route("PUT", API + "/applications/{application_id}/guilds/{guild_id}/commands", self.sync_commands)
+        route("POST", API + "/interactions/{interaction_id}/{token}/callback", self.interaction_callback)
+        route("POST", API + "/webhooks/{webhook_id}/{token}", self.followup)
+        route("GET", API + "/webhooks/{webhook_id}/{token}/messages/{message_id}", self.webhook_message)
+        route("PATCH", API + "/webhooks/{webhook_id}/{token}/messages/{message_id}", self.webhook_message)
+        route("POST", API + "/channels/{channel_id}/messages", self.send_message)
+        route("GET", API + "/channels/{channel_id}/messages", self.history)
+        route("PATCH", API + "/channels/{channel_id}/messages/{message_id}", self.edit_message)
+        route("DELETE", API + "/channels/{channel_id}/messages/{message_id}", self.delete_message)
+        route("POST", API + "/channels/{channel_id}/messages/bulk-delete", self.bulk_delete)
+        route("PUT", API + "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me", self.no_content)
+        route("PUT", API + "/channels/{channel_id}/permissions/{target_id}", self.no_content)
+        route("DELETE", API + "/channels/{channel_id}", self.delete_channel)
+        route("POST", API + "/guilds/{guild_id}/channels", self.create_channel)
+        route("POST", API + "/guilds/{guild_id}/roles", self.create_role)
+        route("GET", API + "/guilds/{guild_id}/bans", self.list_bans)
+        route("PUT", API + "/guilds/{guild_id}/bans/{user_id}", self.ban)
+        route("DELETE", API + "/guilds/{guild_id}/bans/{user_id}", self.unban)
+        route("POST", API + "/guilds/{guild_id}/bulk-ban", self.bulk_ban)
+        route("DELETE", API + "/guilds/{guild_id}/members/{user_id}", self.kick)
+        route("PUT", API + "/guilds/{guild_id}/members/{user_id}/roles/{role_id}", self.no_content)
+        route("DELETE", API + "/guilds/{guild_id}/members/{user_id}/roles/{role_id}", self.no_content)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    def install(self):
+        # Redirige discord.py (REST, webhooks d'interaction et gateway) vers ce serveur
+        discord.http.Route.BASE = f"http://127.0.0.1:{self.port}{API}"
+        discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(f"ws://127.0.0.1:{self.port}/gateway")
+
+    async def close(self):
+        for ws in list(self.sockets):
+            await ws.close()
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    # ---- Latence et rate limits ----
+    @web.middleware
+    async def simulate(self, request, handler):
+        if request.path == "/gateway":
+            return await handler(request)
+        resource = request.match_info.route.resource
+        template = resource.canonical if resource else request.path
+        self.requests[f"{request.method} {template}"] += 1
+        await asyncio.sleep(max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)))
+        # Les réponses d'interaction n'ont pas de bucket chez Discord
+        if "/interactions/" in template:
+            return await handler(request)
+        major = next((request.match_info[k] for k in ("channel_id", "guild_id", "webhook_id") if k in request.match_info), "")
+        key = (request.method, template, major)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            # Comme Discord : même hash pour une route, un bucket par paramètre majeur
+            bucket = self.buckets[key] = Bucket(f"{zlib.crc32(f'{request.method} {template}'.encode()):08x}")
+        now = time.time()
+        if now >= bucket.reset_at:
+            bucket.remaining, bucket.reset_at = self.limit, now + self.window
+        if bucket.remaining <= 0 or self.random.random() < self.rate_limit_chance:
+            self.rate_limited += 1
+            retry_after = max(bucket.reset_at - now, 0.01)
+            return json_response({"message": "You are being rate limited.", "retry_after": retry_after, "global": False}, status=429,
+                                     headers={"Via": "1.1 google", "Retry-After": f"{retry_after:.3f}", "X-RateLimit-Scope": "user" if bucket.remaining <= 0 else "shared",
+                                              "X-RateLimit-Bucket": bucket.name, "X-RateLimit-Limit": str(self.limit), "X-RateLimit-Remaining": "0",
+                                              "X-RateLimit-Reset": f"{bucket.reset_at:.3f}", "X-RateLimit-Reset-After": f"{retry_after:.3f}"})
+        bucket.remaining -= 1
+        response = await handler(request)
+        response.headers.update({"X-RateLimit-Bucket": bucket.name, "X-RateLimit-Limit": str(self.limit), "X-RateLimit-Remaining": str(bucket.remaining),
+                                 "X-RateLimit-Reset": f"{bucket.reset_at:.3f}", "X-RateLimit-Reset-After": f"{max(bucket.reset_at - time.time(), 0):.3f}"})
+        return response
+
+    # ---- Gateway ----
+    async def gateway(self, request):
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        compressor = zlib.compressobj() if request.query.get("compress") == "zlib-stream" else None
+        ws.sequence = 0
+
+        async def send(payload):
+            data = json.dumps(payload)
+            if compressor is None:
+                await ws.send_str(data)
+            else:
+                await ws.send_bytes(compressor.compress(data.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH))
+
+        ws.send_payload = send
+        await send({"op": 10, "d": {"heartbeat_interval": 41250}})
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                payload = json.loads(msg.data)
+                if payload["op"] == 1:
+                    await send({"op": 11})
+                elif payload["op"] == 2:
+                    # Chaque connexion ne reçoit que les serveurs de son shard
+                    ws.shard = payload["d"].get("shard", [0, 1])
+                    guilds = [g for g in self.guilds if self.on_shard(ws, g)]
+                    self.sockets.append(ws)
+                    await self.dispatch_to(ws, "READY", {
+                        "v": 10, "user": self.users[BOT_ID], "session_id": "bench", "resume_gateway_url": f"ws://127.0.0.1:{self.port}/gateway",
+                        "guilds": [{"id": str(g), "unavailable": True} for g in guilds], "shard": ws.shard,
+                        "application": {"id": str(APPLICATION_ID), "flags": 0},
+                    })
+                    for guild_id in guilds:
+                        await self.dispatch_to(ws, "GUILD_CREATE", self.guild_payload(guild_id))
+                elif payload["op"] == 8:
+                    await self.request_members(ws, payload["d"])
+        finally:
+            if ws in self.sockets:
+                self.sockets.remove(ws)
+        return ws
+
+    async def dispatch_to(self, ws, event, data):
+        ws.sequence += 1
+        await ws.send_payload({"op": 0, "t": event, "s": ws.sequence, "d": data})
+
+    async def request_members(self, ws, request):
+        # REQUEST_GUILD_MEMBERS : par IDs, ou par préfixe de pseudo (vide = tous)
+        guild_id = int(request["guild_id"])
+        members = self.members[guild_id]
+        if request.get("user_ids"):
+            found = [members[int(u)] for u in request["user_ids"] if int(u) in members]
+        else:
+            query = (request.get("query") or "").lower()
+            found = [m for m in members.values() if m["user"]["username"].lower().startswith(query)]
+            if request.get("limit"):
+                found = found[:request["limit"]]
+        chunks = [found[i:i + 1000] for i in range(0, len(found), 1000)] or [[]]
+        for index, chunk in enumerate(chunks):
+            await self.dispatch_to(ws, "GUILD_MEMBERS_CHUNK", {"guild_id": str(guild_id), "members": chunk, "chunk_index": index,
+                                                               "chunk_count": len(chunks), "nonce": request.get("nonce")})
+
+    @staticmethod
+    def on_shard(ws, guild_id):
+        shard_id, shard_count = ws.shard
+        return (int(guild_id) >> 22) % shard_count == shard_id
+
+    async def dispatch(self, event, data):
+        guild_id = data.get("guild_id")
+        for ws in list(self.sockets):
+            if guild_id is None or self.on_shard(ws, guild_id):
+                await self.dispatch_to(ws, event, data)
+
+    # ---- Interactions envoyées au bot ----
+    def interaction(self, type, guild_id, channel_id, user_id, data=None, message=None):
+        interaction_id = self.snowflake()
+        member = {**self.members[guild_id][user_id], "permissions": ADMIN}
+        payload = {
+            "id": str(interaction_id), "application_id": str(APPLICATION_ID), "type": type, "token": f"token-{interaction_id}",
+            "version": 1, "guild_id": str(guild_id), "channel_id": str(channel_id), "channel": self.channels[channel_id],
+            "member": member, "app_permissions": ADMIN, "locale": "fr", "guild_locale": "fr", "entitlements": [],
+            "authorizing_integration_owners": {"0": str(guild_id)}, "context": 0, "attachment_size_limit": 10 * 1024 * 1024,
+        }
+        if data is not None:
+            payload["data"] = data
+        if message is not None:
+            payload["message"] = message
+        return interaction_id, payload
+
+    async def send_interaction(self, type, guild_id, channel_id, user_id, data=None, message=None):
+        # Retourne un futur résolu par le premier callback du bot : (délai, corps du callback)
+        interaction_id, payload = self.interaction(type, guild_id, channel_id, user_id, data, message)
+        future = self.callbacks[str(interaction_id)] = asyncio.get_running_loop().create_future()
+        self.sent_at[str(interaction_id)] = time.perf_counter()
+        await self.dispatch("INTERACTION_CREATE", payload)
+        return future
+
+    def command(self, guild_id, channel_id, user_id, name, **options):
+        # Options : int/str/bool tels quels, membres passés par leur ID via member_options
+        data = {"id": "1", "name": name, "type": 1, "options": [], "resolved": {"users": {}, "members": {}, "channels": {}}}
+        for key, value in options.items():
+            if isinstance(value, Mention):
+                data["resolved"]["users"][str(value.id)] = self.users[value.id]
+                data["resolved"]["members"][str(value.id)] = {k: v for k, v in self.members[guild_id][value.id].items() if k != "user"} | {"permissions": "0"}
+                data["options"].append({"name": key, "type": 6, "value": str(value.id)})
+            elif isinstance(value, ChannelOption):
+                data["resolved"]["channels"][str(value.id)] = {**self.channels[value.id], "permissions": ADMIN}
+                data["options"].append({"name": key, "type": 7, "value": str(value.id)})
+            else:
+                option_type = 5 if isinstance(value, bool) else 4 if isinstance(value, int) else 3
+                data["options"].append({"name": key, "type": option_type, "value": value})
+        return self.send_interaction(2, guild_id, channel_id, user_id, data)
+
+    def button(self, guild_id, channel_id, user_id, message, custom_id):
+        return self.send_interaction(3, guild_id, channel_id, user_id, {"custom_id": custom_id, "component_type": 2}, message)
+
+    def modal_submit(self, guild_id, channel_id, user_id, modal, values):
+        # modal : corps du callback de type 9 ; values : valeurs des champs dans l'ordre
+        rows = [{"type": 1, "components": [{"type": 4, "custom_id": row["components"][0]["custom_id"], "value": value}]}
+                for row, value in zip(modal["components"], values)]
+        return self.send_interaction(5, guild_id, channel_id, user_id, {"custom_id": modal["custom_id"], "components": rows})
+
+    # ---- Routes REST ----
+    async def gateway_bot(self, request):
+        return json_response({"url": f"ws://127.0.0.1:{self.port}/gateway", "shards": 1,
+                                  "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1}})
+
+    async def me(self, request):
+        return json_response(self.users[BOT_ID])
+
+    async def application(self, request):
+        return json_response({"id": str(APPLICATION_ID), "name": "ModeratorBot", "icon": None, "description": "", "bot_public": True,
+                                  "bot_require_code_grant": False, "owner": self.users[BOT_ID], "verify_key": "", "flags": 0})
+
+    async def sync_commands(self, request):
+        commands = await request.json()
+        return json_response([{**c, "id": str(self.snowflake()), "application_id": str(APPLICATION_ID), "version": "1"} for c in commands])
+
+    async def no_content(self, request):
+        return web.Response(status=204)
+
+    async def body(self, request):
+        # Les envois avec fichiers sont en multipart : le JSON est dans payload_json
+        if request.content_type.startswith("multipart/"):
+            async for part in await request.multipart():
+                if part.name == "payload_json":
+                    return json.loads(await part.text())
+            return {}
+        return await request.json() if request.can_read_body else {}
+
+    async def interaction_callback(self, request):
+        interaction_id = request.match_info["interaction_id"]
+        body = await self.body(request)
+        future = self.callbacks.pop(interaction_id, None)
+        if future is not None and not future.done():
+            future.set_result((time.perf_counter() - self.sent_at.pop(interaction_id), body))
+        data = body.get("data") or {}
+        result = {"interaction": {"id": interaction_id, "type": 2, "response_message_loading": body["type"] == 5,
+                                  "response_message_ephemeral": bool(data.get("flags", 0) & 64)}, "resource": {"type": body["type"]}}
+        if body["type"] == 4:
+            message_id = self.snowflake()
+            result["interaction"]["response_message_id"] = str(message_id)
+            result["resource"]["message"] = {"id": str(message_id), "channel_id": "0", "author": self.users[BOT_ID], "content": data.get("content") or "",
+                                             "timestamp": iso(), "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [],
+                                             "mention_roles": [], "attachments": [], "embeds": data.get("embeds", []), "pinned": False, "type": 0}
+        return json_response(result)
+
+    def bot_message(self, body, channel_id=None):
+        message = {"id": str(self.snowflake()), "channel_id": str(channel_id or 0), "author": self.users[BOT_ID], "content": body.get("content") or "",
+                   "timestamp": iso(), "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [],
+                   "attachments": [], "embeds": body.get("embeds") or [], "pinned": False, "type": 0, "components": body.get("components") or []}
+        return message
+
+    async def followup(self, request):
+        return json_response(self.bot_message(await self.body(request)))
+
+    async def webhook_message(self, request):
+        body = await self.body(request) if request.method == "PATCH" else {}
+        return json_response(self.bot_message(body))
+
+    async def send_message(self, request):
+        channel_id = int(request.match_info["channel_id"])
+        if channel_id not in self.channels:
+            return json_response({"message": "Unknown Channel", "code": 10003}, status=404)
+        body = await self.body(request)
+        message = self.add_message(channel_id, BOT_ID, body.get("content") or "", body.get("components") or [])
+        message["embeds"] = body.get("embeds") or []
+        return json_response(message)
+
+    async def edit_message(self, request):
+        body = await self.body(request)
+        message = self.messages[int(request.match_info["channel_id"])].get(int(request.match_info["message_id"]))
+        if message is None:
+            return json_response({"message": "Unknown Message", "code": 10008}, status=404)
+        message.update({k: v for k, v in body.items() if k in ("content", "embeds", "components")})
+        return json_response(message)
+
+    async def history(self, request):
+        # Même ordre que Discord : du plus récent au plus ancien
+        messages = self.messages[int(request.match_info["channel_id"])]
+        limit = int(request.query.get("limit", 50))
+        ids = sorted(messages)
+        if "before" in request.query:
+            ids = [i for i in ids if i < int(request.query["before"])][-limit:]
+        elif "after" in request.query:
+            ids = [i for i in ids if i > int(request.query["after"])][:limit]
+        else:
+            ids = ids[-limit:]
+        return json_response([messages[i] for i in reversed(ids)])
+
+    async def delete_message(self, request):
+        self.messages[int(request.match_info["channel_id"])].pop(int(request.match_info["message_id"]), None)
+        return web.Response(status=204)
+
+    async def bulk_delete(self, request):
+        body = await self.body(request)
+        messages = self.messages[int(request.match_info["channel_id"])]
+        for message_id in body["messages"]:
+            messages.pop(int(message_id), None)
+        return web.Response(status=204)
+
+    async def create_channel(self, request):
+        guild_id = int(request.match_info["guild_id"])
+        body = await self.body(request)
+        channel_id = self.add_channel(guild_id, body["name"], body.get("type", 0), body.get("parent_id"), body.get("permission_overwrites", ()))
+        await self.dispatch("CHANNEL_CREATE", self.channels[channel_id])
+        return json_response(self.channels[channel_id])
+
+    async def delete_channel(self, request):
+        channel = self.channels.pop(int(request.match_info["channel_id"]), None)
+        if channel is None:
+            return json_response({"message": "Unknown Channel", "code": 10003}, status=404)
+        self.messages.pop(int(channel["id"]), None)
+        await self.dispatch("CHANNEL_DELETE", channel)
+        return json_response(channel)
+
+    async def create_role(self, request):
+        guild_id = int(request.match_info["guild_id"])
+        body = await self.body(request)
+        role_id = self.add_role(guild_id, body.get("name", "new role"), str(body.get("permissions", "0")))
+        role = {k: v for k, v in self.roles[role_id].items() if k != "guild_id"}
+        await self.dispatch("GUILD_ROLE_CREATE", {"guild_id": str(guild_id), "role": role})
+        return json_response(role)
+
+    async def list_bans(self, request):
+        guild_id = int(request.match_info["guild_id"])
+        return json_response([{"user": self.users[u], "reason": None} for u in sorted(self.bans[guild_id])][:int(request.query.get("limit", 1000))])
+
+    async def remove_member(self, guild_id, user_id):
+        if self.members[guild_id].pop(user_id, None) is not None:
+            await self.dispatch("GUILD_MEMBER_REMOVE", {"guild_id": str(guild_id), "user": self.users[user_id]})
+
+    async def ban(self, request):
+        guild_id, user_id = int(request.match_info["guild_id"]), int(request.match_info["user_id"])
+        self.bans[guild_id].add(user_id)
+        await self.remove_member(guild_id, user_id)
+        return web.Response(status=204)
+
+    async def unban(self, request):
+        self.bans[int(request.match_info["guild_id"])].discard(int(request.match_info["user_id"]))
+        return web.Response(status=204)
+
+    async def bulk_ban(self, request):
+        guild_id = int(request.match_info["guild_id"])
+        user_ids = [int(u) for u in (await self.body(request))["user_ids"]]
+        for user_id in user_ids:
+            self.bans[guild_id].add(user_id)
+            await self.remove_member(guild_id, user_id)
+        return json_response({"banned_users": [str(u) for u in user_ids], "failed_users": []})
+
+    async def kick(self, request):
+        await self.remove_member(int(request.match_info["guild_id"]), int(request.match_info["user_id"]))
+        return web.Response(status=204)
+
+
+# Marqueurs pour les options de commande qui doivent être « résolues »
+class Mention:
+    def __init__(self, id):
+        self.id = id
+
+
+class ChannelOption:
+    def __init__(self, id):
+        self.id = id
@@ -0,0 +1,208 @@
+import asyncio
+import dataclasses
+import os
+import resource
+import sys
+import time
+from collections import OrderedDict, deque
+from datetime import timedelta
+from itertools import islice
+import discord
+from discord.state import ConnectionState
+
+
+# ------------------ POLITIQUE DE CACHE ------------------
+# « all »    : comportement de discord.py, tous les membres en cache (chunk au démarrage)
+# « active » : seuls le staff, les nouveaux arrivants et les membres actifs
+#              (message, interaction) restent en cache ; les autres sont
+#              demandés à la gateway au besoin
+@dataclasses.dataclass(frozen=True)
+class CachePolicy:
+    members: str = "all"
+    # « startup » : chunk de chaque serveur au démarrage ; « lazy » : à la demande
+    chunking: str = "startup"
+    # Messages gardés par discord.py (tous serveurs confondus), None = aucun
+    max_messages: int | None = 1000
+    # Durée pendant laquelle un membre actif ou arrivé reste en cache (s)
+    active_ttl: float = 3600.0
+    # Membres actifs suivis au plus par serveur
+    max_active: int = 5000
+
+    @property
+    def lean(self):
+        return self.members == "active"
+
+    @classmethod
+    def from_env(cls):
+        members = os.getenv("MEMBER_CACHE", "all")
+        lean = members == "active"
+        max_messages = int(os.getenv("MAX_MESSAGES", "100" if lean else "1000"))
+        return cls(
+            members=members,
+            chunking=os.getenv("GUILD_CHUNKING", "lazy" if lean else "startup"),
+            max_messages=max_messages or None,
+            active_ttl=float(os.getenv("ACTIVE_MEMBER_TTL", "3600")),
+            max_active=int(os.getenv("MAX_ACTIVE_MEMBERS", "5000")),
+        )
+
+    def client_options(self, intents):
+        # Arguments passés au constructeur du bot
+        return dict(
+            member_cache_flags=discord.MemberCacheFlags.from_intents(intents),
+            chunk_guilds_at_startup=self.chunking == "startup",
+            max_messages=self.max_messages,
+        )
+
+
+def is_staff(member: discord.Member):
+    perms = member.guild_permissions
+    return member.id == member.guild.owner_id or perms.administrator or perms.manage_messages or perms.ban_members or perms.kick_members
+
+
+# ------------------ MEMBRES ACTIFS ------------------
+# discord.py ne met en cache que les arrivées (et le chunk éventuel) : les
+# membres vus dans un message ou une interaction y sont ajoutés, et un
+# balayage périodique retire ceux qui ne sont ni staff, ni actifs, ni arrivés
+# récemment. `on_evict(member)` garde les index annexes cohérents.
+class ActiveMembers:
+    def __init__(self, policy: CachePolicy, on_evict=None):
+        self.policy = policy
+        self.on_evict = on_evict
+        self.seen = {}
+
+    def touch(self, member):
+        if not self.policy.lean or not isinstance(member, discord.Member):
+            return
+        guild = member.guild
+        if guild.get_member(member.id) is None:
+            guild._add_member(member)
+        seen = self.seen.setdefault(guild.id, OrderedDict())
+        seen[member.id] = time.monotonic()
+        seen.move_to_end(member.id)
+        if len(seen) > self.policy.max_active:
+            seen.popitem(last=False)
+
+    def forget(self, guild_id):
+        self.seen.pop(guild_id, None)
+
+    def keep(self, member, now, joined_after):
+        if member.id == member.guild.me.id or is_staff(member):
+            return True
+        if member.joined_at is not None and member.joined_at >= joined_after:
+            return True
+        seen = self.seen.get(member.guild.id, {}).get(member.id)
+        return seen is not None and now - seen < self.policy.active_ttl
+
+    def sweep(self, guild: discord.Guild):
+        now = time.monotonic()
+        joined_after = discord.utils.utcnow() - timedelta(seconds=self.policy.active_ttl)
+        seen = self.seen.get(guild.id)
+        if seen:
+            # Les entrées expirées sont en tête (ordre d'activité)
+            while seen and now - next(iter(seen.values())) >= self.policy.active_ttl:
+                seen.popitem(last=False)
+        evicted = 0
+        for member in guild.members:
+            if not self.keep(member, now, joined_after):
+                guild._remove_member(member)
+                if self.on_evict is not None:
+                    self.on_evict(member)
+                evicted += 1
+        return evicted
+
+    async def sweep_loop(self, bot, interval=300.0):
+        if not self.policy.lean:
+            return
+        while True:
+            await asyncio.sleep(interval)
+            for guild in bot.guilds:
+                self.sweep(guild)
+                await asyncio.sleep(0)
+
+    async def ensure(self, guild: discord.Guild, user_ids):
+        # Met en cache les membres demandés qui n'y sont pas encore (100 par requête gateway)
+        if not self.policy.lean or guild.chunked:
+            return
+        missing = [user_id for user_id in user_ids if guild.get_member(user_id) is None]
+        for i in range(0, len(missing), 100):
+            for member in await guild.query_members(user_ids=missing[i:i + 100], cache=True):
+                self.touch(member)
+
+    async def ensure_all(self, guild: discord.Guild):
+        # Chunk à la demande (recherche sur tous les membres) ; le balayage
+        # suivant retire à nouveau les inactifs
+        if not guild.chunked:
+            await guild.chunk(cache=True)
+
+
+# ------------------ RAPPORT MÉMOIRE ------------------
+# Objets partagés auxquels on s'arrête pour mesurer un membre, un message ou un serveur
+SHARED = (ConnectionState, discord.Client, discord.Guild, discord.abc.GuildChannel, discord.Thread, asyncio.AbstractEventLoop)
+
+
+def slot_names(cls):
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        yield from (slots,) if isinstance(slots, str) else slots
+
+
+def deep_sizeof(obj, skip=SHARED):
+    # Taille approximative d'un objet et de ce qu'il référence, sans compter les
+    # objets partagés (`skip`) ni les classes, modules et fonctions
+    seen, total, stack = set(), 0, [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or (o is not obj and isinstance(o, skip)) or isinstance(o, (type, type(sys), type(deep_sizeof))):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(o)
+        elif not isinstance(o, (str, bytes, int, float)):
+            for name in slot_names(type(o)):
+                value = getattr(o, name, None)
+                if value is not None:
+                    stack.append(value)
+            if hasattr(o, "__dict__"):
+                stack.append(o.__dict__)
+    return total
+
+
+def mean_size(objects, skip=SHARED):
+    sizes = [deep_sizeof(o, skip) for o in objects]
+    return sum(sizes) / len(sizes) if sizes else 0.0
+
+
+def resident_memory():
+    # Mémoire résidente actuelle (Linux), sinon le pic du processus
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, IndexError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def memory_report(bot, sample=200):
+    # Octets moyens par serveur (hors membres), membre et message, estimés sur
+    # un échantillon puis multipliés par le nombre d'objets en cache
+    guilds = bot.guilds
+    members = sum(len(guild.members) for guild in guilds)
+    messages = bot.cached_messages
+    per_guild = mean_size(guilds[:sample], SHARED + (discord.Member,))
+    per_member = mean_size(islice((m for guild in guilds for m in guild.members), sample))
+    per_message = mean_size(list(messages)[-sample:])
+    return {
+        "rss": resident_memory(),
+        "guilds": len(guilds),
+        "members": members,
+        "member_count": sum(guild.member_count or 0 for guild in guilds),
+        "users": len(bot.users),
+        "messages": len(messages),
+        "bytes_per_guild": per_guild,
+        "bytes_per_member": per_member,
+        "bytes_per_message": per_message,
+        "estimated": per_guild * len(guilds) + per_member * members + per_message * len(messages),
+    }
@@ -0,0 +1,75 @@
+# Messages et embeds envoyés au nom du bot (/say, /createembed).
+import discord
+from discord import app_commands
+import asyncio
+import re
+import metrics
+import staff_logs
+from extensions import Extension
+from core import webhook_cache, send_staff_log
+
+ext = Extension("embeds")
+
+# ------------------ SAY ------------------
+@ext.command(name="say", description="Faire parler le bot via modal")
+@app_commands.describe(salon="Salon où envoyer le message")
+@app_commands.checks.has_permissions(administrator=True)
+async def say(interaction: discord.Interaction, salon: discord.TextChannel):
+    class SayModal(metrics.InstrumentedModal, title="Message à envoyer"):
+        contenu = discord.ui.TextInput(label="Message", style=discord.TextStyle.paragraph, required=True)
+        async def on_submit(self, inter: discord.Interaction):
+            await salon.send(self.contenu.value)
+            await inter.response.send_message(f"✅ Message envoyé dans {salon.mention}", ephemeral=True)
+            await send_staff_log(interaction.guild, "💬 /say utilisé", f"Message envoyé par {interaction.user.mention} dans {salon.mention}:\n{self.contenu.value}", priority=staff_logs.LOW)
+    await interaction.response.send_modal(SayModal())
+
+# ------------------ CREATE EMBED ------------------
+def split_targets(value: str | None):
+    return [v for v in re.split(r"[\s,]+", value or "") if v]
+
+@ext.command(name="createembed", description="Créer un embed personnalisable")
+@app_commands.describe(salon="Salon obligatoire", webhook="Webhook(s) facultatif(s), séparés par des espaces", mentions="Mentions facultatives", autres_salons="Autres salons où diffuser l'embed (mentions)")
+@app_commands.checks.has_permissions(administrator=True)
+async def createembed(interaction: discord.Interaction, salon: discord.TextChannel, webhook: str | None = None, mentions: str | None = None, autres_salons: str | None = None):
+    class EmbedModal(metrics.InstrumentedModal, title="Création d'Embed"):
+        title_field = discord.ui.TextInput(label="Titre", required=True)
+        description_field = discord.ui.TextInput(label="Description", style=discord.TextStyle.paragraph, required=True)
+        footer_field = discord.ui.TextInput(label="Footer", required=False)
+        image_field = discord.ui.TextInput(label="URL Image", required=False)
+        thumbnail_field = discord.ui.TextInput(label="URL Thumbnail", required=False)
+        color_field = discord.ui.TextInput(label="Couleur HEX (ex: #FF9900)", required=False)
+        buttons_field = discord.ui.TextInput(label="Boutons (texte|URL, séparés par |)", required=False)
+        async def on_submit(self, inter: discord.Interaction):
+            color = discord.Color.default()
+            if self.color_field.value:
+                try: color = discord.Color(int(self.color_field.value.replace("#",""),16))
+                except: await inter.response.send_message("❌ Couleur invalide.", ephemeral=True); return
+            embed = discord.Embed(title=self.title_field.value, description=self.description_field.value, color=color)
+            if self.footer_field.value: embed.set_footer(text=self.footer_field.value)
+            if self.image_field.value: embed.set_image(url=self.image_field.value)
+            if self.thumbnail_field.value: embed.set_thumbnail(url=self.thumbnail_field.value)
+            await inter.response.defer(ephemeral=True, thinking=True)
+            # Toutes les destinations sont servies en parallèle
+            sends, failed = [], []
+            if webhook:
+                for url in split_targets(webhook):
+                    try: sends.append(webhook_cache.get(url).send(content=mentions or "", embed=embed))
+                    except ValueError: failed.append(url)
+            else:
+                sends.append(salon.send(content=mentions or "", embed=embed))
+            for ch_id in re.findall(r"<#(\d+)>", autres_salons or ""):
+                channel = inter.guild.get_channel(int(ch_id))
+                if channel: sends.append(channel.send(content=mentions or "", embed=embed))
+                else: failed.append(f"<#{ch_id}>")
+            results = await asyncio.gather(*sends, return_exceptions=True)
+            ok = sum(not isinstance(r, Exception) for r in results)
+            msg = f"✅ Embed envoyé dans {salon.mention}" if ok == len(sends) == 1 and not failed else f"✅ Embed envoyé vers {ok} destination(s)"
+            errors = len(failed) + len(results) - ok
+            if errors:
+                msg += f"\n❌ {errors} envoi(s) en échec"
+            await inter.followup.send(msg, ephemeral=True)
+            await send_staff_log(interaction.guild, "📄 Embed créé", f"Embed envoyé par {interaction.user.mention} dans {salon.mention}", priority=staff_logs.LOW)
+    await interaction.response.send_modal(EmbedModal())
+
+setup = ext.setup
+teardown = ext.teardown
@@ -0,0 +1,432 @@
+# Sanctions (ban, kick, mute, warn, purge, raid), fins de sanctions
+# programmées, automod et historique.
+import discord
+from discord import app_commands
+import asyncio
+import dataclasses
+import re
+import time
+from datetime import timedelta
+from typing import Literal
+import automod
+import metrics
+import staff_logs
+from jobs import BulkJob, report_progress, spawn
+from purge import PurgeJob, PurgeFilter
+from guild_config import AutoModRules
+from extensions import Extension
+from core import (bot, scheduler, ledger, guild_configs, active_members, automod_engine, send_staff_log, parse_time,
+                  get_mute_role, get_or_create_mute_role, mute_overwrite_missing, apply_mute_overwrite,
+                  report_mute_role_setup, apply_mute, apply_warn)
+
+ext = Extension("moderation")
+
+# ------------------ EXPIRATIONS ------------------
+@scheduler.handler("unban")
+async def expire_ban(entry):
+    guild = bot.get_guild(entry["guild"])
+    if not guild:
+        return
+    await guild.unban(discord.Object(id=entry["user"]), reason="Ban temporaire expiré")
+    ledger.record(guild.id, entry["user"], None, "unban", "Ban temporaire expiré")
+    await send_staff_log(guild, "✅ Ban temporaire terminé", f"<@{entry['user']}> a été débanni automatiquement après {entry['duration']}")
+
+@scheduler.handler("unmute")
+async def expire_mute(entry):
+    guild = bot.get_guild(entry["guild"])
+    if not guild:
+        return
+    role = guild.get_role(entry["role"])
+    if not role:
+        return
+    member = guild.get_member(entry["user"])
+    if member is None:
+        # Absent du cache (MEMBER_CACHE=active) ou parti entre-temps : dans ce
+        # dernier cas il a perdu ses rôles en quittant le serveur
+        try:
+            member = await guild.fetch_member(entry["user"])
+        except discord.NotFound:
+            return
+    await member.remove_roles(role, reason="Mute temporaire expiré")
+    ledger.record(guild.id, member.id, None, "unmute", "Mute temporaire expiré")
+    await send_staff_log(guild, "✅ Mute terminé", f"{member.mention} a été unmute automatiquement après {entry['duration']}")
+
+# ------------------ RÔLE MUTED ------------------
+@ext.listen()
+async def on_guild_channel_create(channel: discord.abc.GuildChannel):
+    # Nouveau salon : on ne répare que lui, sans rescanner tout le serveur
+    role = get_mute_role(channel.guild)
+    if role and mute_overwrite_missing(channel, role):
+        await apply_mute_overwrite(channel, role)
+
+# ------------------ MODÉRATION ------------------
+@ext.command(name="ban", description="Bannir un utilisateur")
+@app_commands.describe(user="Utilisateur à bannir", temps="Durée (facultatif, ex: 1d, 2h)", raison="Raison du ban")
+@app_commands.checks.has_permissions(ban_members=True)
+async def ban(interaction: discord.Interaction, user: discord.Member, temps: str | None = None, raison: str | None = None):
+    raison_text = raison or "Raison non donnée"
+    await user.ban(reason=raison_text)
+    ledger.record(interaction.guild.id, user.id, interaction.user.id, "ban", raison_text, temps)
+    embed = discord.Embed(title="⛔ Utilisateur banni", color=discord.Color.red(), timestamp=discord.utils.utcnow())
+    embed.add_field(name="Utilisateur", value=user.mention, inline=True)
+    embed.add_field(name="Par", value=interaction.user.mention, inline=True)
+    embed.add_field(name="Raison", value=raison_text, inline=False)
+    await interaction.response.send_message(embed=embed)
+    await send_staff_log(interaction.guild, "⛔ Utilisateur banni", f"{user.mention} banni par {interaction.user.mention} | Raison : {raison_text}", priority=staff_logs.HIGH)
+    seconds = parse_time(temps)
+    if seconds:
+        await scheduler.schedule("unban", interaction.guild.id, user.id, seconds, duration=temps)
+    else:
+        # Ban définitif : un ancien ban temporaire ne doit plus le lever
+        await scheduler.cancel("unban", interaction.guild.id, user.id)
+
+@ext.command(name="unban", description="Débannir un utilisateur")
+@app_commands.describe(user="Utilisateur à débannir")
+@app_commands.checks.has_permissions(ban_members=True)
+async def unban(interaction: discord.Interaction, user: discord.User):
+    await interaction.guild.unban(user, reason=f"Débanni par {interaction.user}")
+    await scheduler.cancel("unban", interaction.guild.id, user.id)
+    ledger.record(interaction.guild.id, user.id, interaction.user.id, "unban")
+    embed = discord.Embed(title="✅ Utilisateur débanni", color=discord.Color.green(), timestamp=discord.utils.utcnow())
+    embed.add_field(name="Utilisateur", value=user.mention)
+    embed.add_field(name="Par", value=interaction.user.mention)
+    await interaction.response.send_message(embed=embed)
+    await send_staff_log(interaction.guild, "✅ Utilisateur débanni", f"{user.mention} débanni par {interaction.user.mention}")
+
+@ext.command(name="kick", description="Expulser un utilisateur")
+@app_commands.describe(user="Utilisateur à expulser", raison="Raison (facultatif)")
+@app_commands.checks.has_permissions(kick_members=True)
+async def kick(interaction: discord.Interaction, user: discord.Member, raison: str | None = None):
+    raison_text = raison or "Raison non donnée"
+    await user.kick(reason=raison_text)
+    ledger.record(interaction.guild.id, user.id, interaction.user.id, "kick", raison_text)
+    embed = discord.Embed(title="👢 Utilisateur expulsé", color=discord.Color.orange(), timestamp=discord.utils.utcnow())
+    embed.add_field(name="Utilisateur", value=user.mention)
+    embed.add_field(name="Par", value=interaction.user.mention)
+    embed.add_field(name="Raison", value=raison_text)
+    await interaction.response.send_message(embed=embed)
+    await send_staff_log(interaction.guild, "👢 Utilisateur expulsé", f"{user.mention} expulsé par {interaction.user.mention} | Raison : {raison_text}", priority=staff_logs.HIGH)
+
+@ext.command(name="mute", description="Mute un utilisateur")
+@app_commands.describe(user="Utilisateur à mute", temps="Durée obligatoire (ex: 10m, 1h)", raison="Raison (facultatif)")
+@app_commands.checks.has_permissions(manage_roles=True)
+async def mute(interaction: discord.Interaction, user: discord.Member, temps: str, raison: str | None = None):
+    await apply_mute(interaction.guild, user, interaction.user, temps, raison)
+    embed = discord.Embed(title="🔇 Utilisateur muté", color=discord.Color.dark_gray(), timestamp=discord.utils.utcnow())
+    embed.add_field(name="Utilisateur", value=user.mention)
+    embed.add_field(name="Par", value=interaction.user.mention)
+    embed.add_field(name="Raison", value=raison or "Raison non donnée")
+    embed.add_field(name="Durée", value=temps)
+    await interaction.response.send_message(embed=embed)
+    await report_mute_role_setup(interaction)
+
+@ext.command(name="unmute", description="Unmute un utilisateur")
+@app_commands.describe(user="Utilisateur à unmute")
+@app_commands.checks.has_permissions(manage_roles=True)
+async def unmute(interaction: discord.Interaction, user: discord.Member):
+    mute_role = await get_or_create_mute_role(interaction.guild)
+    await user.remove_roles(mute_role, reason=f"Unmute par {interaction.user}")
+    await scheduler.cancel("unmute", interaction.guild.id, user.id)
+    ledger.record(interaction.guild.id, user.id, interaction.user.id, "unmute")
+    embed = discord.Embed(title="✅ Utilisateur unmute", color=discord.Color.green(), timestamp=discord.utils.utcnow())
+    embed.add_field(name="Utilisateur", value=user.mention)
+    embed.add_field(name="Par", value=interaction.user.mention)
+    await interaction.response.send_message(embed=embed)
+    await send_staff_log(interaction.guild, "✅ Utilisateur unmute", f"{user.mention} unmute par {interaction.user.mention}")
+
+# Messages parcourus au plus quand des filtres sont donnés
+PURGE_SCAN_LIMIT = 10000
+
+@ext.command(name="purge", description="Supprimer un nombre de messages")
+@app_commands.describe(
+    nombre="Nombre de messages à supprimer",
+    utilisateur="Seulement les messages de cet utilisateur",
+    contenu="Seulement les messages correspondant à cette expression régulière",
+    bots="Seulement les messages de bots",
+    pieces_jointes="Seulement les messages avec pièce jointe"
+)
+@app_commands.checks.has_permissions(manage_messages=True)
+async def purge(interaction: discord.Interaction, nombre: app_commands.Range[int, 1, PURGE_SCAN_LIMIT], utilisateur: discord.User | None = None, contenu: str | None = None, bots: bool = False, pieces_jointes: bool = False):
+    try:
+        pattern = re.compile(contenu, re.IGNORECASE) if contenu else None
+    except re.error:
+        return await interaction.response.send_message("❌ Expression régulière invalide.", ephemeral=True)
+    check = PurgeFilter(user_id=utilisateur.id if utilisateur else None, pattern=pattern, bots=bots, attachments=pieces_jointes)
+    # Réponse différée tout de suite : une grosse purge dépasse les 3 s de l'interaction
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    job = PurgeJob(interaction.channel, nombre, check, scan_limit=PURGE_SCAN_LIMIT, reason=f"Purge par {interaction.user}").start()
+    msg = await interaction.followup.send(job.progress_text(), ephemeral=True, wait=True)
+    # Le jeton de l'interaction expire après 15 minutes : le suivi s'arrête
+    # alors, mais le résumé est posté dans le salon une fois la purge terminée
+    await report_progress(job, msg.edit, interval=1.0)
+    await asyncio.wait({job.task})
+    error = job.error
+    embed = discord.Embed(title="🧹 Messages supprimés", color=discord.Color.red() if error else discord.Color.blurple(), timestamp=discord.utils.utcnow())
+    embed.add_field(name="Nombre supprimé", value=str(job.done))
+    embed.add_field(name="Par", value=interaction.user.mention)
+    if check.active:
+        embed.add_field(name="Filtre", value=check.describe())
+    if error:
+        embed.add_field(name="Interrompue", value=f"{type(error).__name__} : {error}"[:1024], inline=False)
+    try:
+        await interaction.channel.send(embed=embed)
+    except discord.HTTPException:
+        pass
+    summary = f"{job.done} messages supprimés ({check.describe()}) par {interaction.user.mention} dans {interaction.channel.mention} | Échecs : {job.failed}"
+    if error:
+        summary += f" | Interrompue : {type(error).__name__}"
+    await send_staff_log(interaction.guild, "🧹 Purge", summary, color=discord.Color.red() if error else discord.Color.blue())
+
+@ext.command(name="warn", description="Avertir un utilisateur")
+@app_commands.describe(user="Utilisateur à avertir", raison="Raison de l'avertissement")
+@app_commands.checks.has_permissions(kick_members=True)
+async def warn(interaction: discord.Interaction, user: discord.Member, raison: str):
+    await apply_warn(interaction.guild, user, interaction.user, raison)
+    embed = discord.Embed(title="⚠️ Avertissement", color=discord.Color.yellow(), timestamp=discord.utils.utcnow())
+    embed.add_field(name="Utilisateur", value=user.mention)
+    embed.add_field(name="Par", value=interaction.user.mention)
+    embed.add_field(name="Raison", value=raison)
+    await interaction.response.send_message(embed=embed)
+
+@ext.command(name="logsconfig", description="Choisir le salon des staff logs")
+@app_commands.describe(salon="Salon des staff logs")
+@app_commands.checks.has_permissions(administrator=True)
+async def logsconfig(interaction: discord.Interaction, salon: discord.TextChannel):
+    await guild_configs.update(interaction.guild.id, log_channel_id=salon.id)
+    await interaction.response.send_message(f"✅ Les staff logs seront envoyés dans {salon.mention}", ephemeral=True)
+
+# ------------------ RAID ------------------
+# Limite de l'endpoint de ban groupé de Discord
+RAID_BAN_BATCH = 200
+
+def is_protected(member: discord.Member, moderator: discord.Member):
+    guild = member.guild
+    if member.id in (guild.owner_id, guild.me.id, moderator.id):
+        return True
+    if member.guild_permissions.manage_messages or member.top_role >= guild.me.top_role:
+        return True
+    return moderator.id != guild.owner_id and member.top_role >= moderator.top_role
+
+def collect_raid_targets(guild: discord.Guild, moderator: discord.Member, ids, since_seconds, pattern):
+    targets = {}
+    for user_id in ids:
+        targets[user_id] = guild.get_member(user_id) or discord.Object(id=user_id)
+    if since_seconds or pattern:
+        since = discord.utils.utcnow() - timedelta(seconds=since_seconds) if since_seconds else None
+        for member in guild.members:
+            if since and (member.joined_at is None or member.joined_at < since):
+                continue
+            if pattern and not any(pattern.search(n) for n in (member.name, member.global_name, member.nick) if n):
+                continue
+            targets[member.id] = member
+    return [t for t in targets.values() if not (isinstance(t, discord.Member) and is_protected(t, moderator))]
+
+@ext.command(name="raid", description="Sanctionner en masse les comptes d'un raid")
+@app_commands.describe(
+    action="Sanction à appliquer",
+    ids="IDs ou mentions séparés par des espaces",
+    depuis="Membres arrivés depuis (ex: 10m, 1h)",
+    pseudo="Expression régulière sur le pseudo",
+    temps="Durée (obligatoire pour un mute, facultative pour un ban)",
+    raison="Raison (facultatif)",
+    simulation="Lister les cibles sans les sanctionner"
+)
+@app_commands.checks.has_permissions(ban_members=True, kick_members=True, manage_roles=True)
+async def raid(interaction: discord.Interaction, action: Literal["ban", "kick", "mute"], ids: str | None = None, depuis: str | None = None, pseudo: str | None = None, temps: str | None = None, raison: str | None = None, simulation: bool = False):
+    guild = interaction.guild
+    user_ids = [int(x) for x in re.findall(r"\d{15,20}", ids or "")]
+    since_seconds = parse_time(depuis) if depuis else None
+    if depuis and not since_seconds:
+        return await interaction.response.send_message("❌ Durée `depuis` invalide.", ephemeral=True)
+    try:
+        pattern = re.compile(pseudo, re.IGNORECASE) if pseudo else None
+    except re.error:
+        return await interaction.response.send_message("❌ Expression régulière invalide.", ephemeral=True)
+    if not (user_ids or since_seconds or pattern):
+        return await interaction.response.send_message("❌ Indiquez des IDs, une fenêtre d'arrivée ou un motif de pseudo.", ephemeral=True)
+    seconds = parse_time(temps)
+    if action == "mute" and not seconds:
+        return await interaction.response.send_message("❌ Un mute de masse demande une durée valide.", ephemeral=True)
+
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    # Cache partiel : cibles (pour la protection du staff) et, si on filtre
+    # sur tout le serveur, chunk à la demande
+    await active_members.ensure(guild, user_ids)
+    if since_seconds or pattern:
+        await active_members.ensure_all(guild)
+    targets = collect_raid_targets(guild, interaction.user, user_ids, since_seconds, pattern)
+    if action != "ban":
+        # Seul le ban fonctionne sur des comptes qui ont déjà quitté le serveur
+        targets = [t for t in targets if isinstance(t, discord.Member)]
+    if simulation or not targets:
+        preview = " ".join(f"<@{t.id}>" for t in targets[:30])
+        more = f" (+{len(targets) - 30})" if len(targets) > 30 else ""
+        return await interaction.followup.send(f"🔎 {len(targets)} cible(s) pour `{action}` : {preview}{more}", ephemeral=True)
+
+    raison_text = raison or "Raid"
+    if action == "ban":
+        async def sanction(batch):
+            result = await guild.bulk_ban(batch, reason=raison_text)
+            for user in result.banned:
+                ledger.record(guild.id, user.id, interaction.user.id, "ban", raison_text, temps)
+                if seconds:
+                    await scheduler.schedule("unban", guild.id, user.id, seconds, duration=temps)
+                else:
+                    await scheduler.cancel("unban", guild.id, user.id)
+            return len(result.failed)
+        batches = [targets[i:i + RAID_BAN_BATCH] for i in range(0, len(targets), RAID_BAN_BATCH)]
+        job = BulkJob("Raid : ban", batches, sanction, concurrency=2, weight=len)
+    elif action == "kick":
+        async def sanction(member):
+            await member.kick(reason=raison_text)
+            ledger.record(guild.id, member.id, interaction.user.id, "kick", raison_text)
+        job = BulkJob("Raid : kick", targets, sanction, concurrency=10)
+    else:
+        await get_or_create_mute_role(guild)
+        job = BulkJob("Raid : mute", targets, lambda m: apply_mute(guild, m, interaction.user, temps, raison_text, log=False), concurrency=10)
+
+    job.start()
+    msg = await interaction.followup.send(job.progress_text(), ephemeral=True, wait=True)
+    await report_progress(job, msg.edit, interval=1.0)
+    # Le suivi s'arrête si le jeton de l'interaction expire : le résumé attend la fin du raid
+    await asyncio.wait({job.task})
+    await send_staff_log(guild, f"🚨 Raid : {action} de masse", f"{job.done}/{job.total} compte(s) sanctionné(s) par {interaction.user.mention} en {job.elapsed():.1f}s | Échecs : {job.failed} | Raison : {raison_text}", color=discord.Color.red(), priority=staff_logs.HIGH)
+
+# ------------------ AUTOMOD ------------------
+async def handle_automod(message: discord.Message, verdict):
+    guild, member = message.guild, message.author
+    try:
+        await message.delete()
+    except discord.HTTPException:
+        pass
+    raison = f"Automod : {verdict.reason}"
+    if verdict.action == "mute":
+        await apply_mute(guild, member, guild.me, automod_engine.rules(guild.id)["mute_duration"], raison)
+    else:
+        await apply_warn(guild, member, guild.me, raison)
+
+@ext.listen("on_message")
+async def check_message(message: discord.Message):
+    if message.guild is None or message.author.bot:
+        return
+    # Le staff n'est pas soumis à l'automod
+    if isinstance(message.author, discord.Member) and not message.author.guild_permissions.manage_messages:
+        verdict = automod_engine.check(message.guild.id, message.author.id, message.content, time.monotonic())
+        if verdict:
+            spawn(handle_automod(message, verdict))
+
+async def update_automod_rules(guild_id: int, **changes):
+    rules = dataclasses.replace(guild_configs.config(guild_id).automod or AutoModRules(), **changes)
+    await guild_configs.update(guild_id, automod=rules)
+    automod_engine.invalidate(guild_id)
+    return rules
+
+automod_group = app_commands.Group(name="automod", description="Configurer l'automod")
+
+@automod_group.command(name="mot", description="Ajouter ou retirer un mot interdit")
+@app_commands.describe(action="Ajouter ou retirer", mot="Mot interdit")
+@app_commands.checks.has_permissions(administrator=True)
+async def automod_word(interaction: discord.Interaction, action: Literal["ajouter", "retirer"], mot: str):
+    rules = automod_engine.rules(interaction.guild.id) or automod.DEFAULT_RULES
+    words = [w for w in rules["words"] if w != mot.lower()]
+    if action == "ajouter":
+        words.append(mot.lower())
+    await update_automod_rules(interaction.guild.id, words=tuple(words))
+    await interaction.response.send_message(f"✅ Mot {'ajouté' if action == 'ajouter' else 'retiré'} : ||{mot}||", ephemeral=True)
+
+@automod_group.command(name="regex", description="Ajouter ou retirer un motif interdit (regex)")
+@app_commands.describe(action="Ajouter ou retirer", motif="Expression régulière")
+@app_commands.checks.has_permissions(administrator=True)
+async def automod_regex(interaction: discord.Interaction, action: Literal["ajouter", "retirer"], motif: str):
+    if action == "ajouter" and not automod.validate_regex(motif):
+        return await interaction.response.send_message("❌ Expression régulière invalide.", ephemeral=True)
+    rules = automod_engine.rules(interaction.guild.id) or automod.DEFAULT_RULES
+    patterns = [p for p in rules["regex"] if p != motif]
+    if action == "ajouter":
+        patterns.append(motif)
+    if not automod.validate_patterns(patterns):
+        return await interaction.response.send_message("❌ Ce motif ne peut pas être combiné avec les règles existantes.", ephemeral=True)
+    await update_automod_rules(interaction.guild.id, regex=tuple(patterns))
+    await interaction.response.send_message(f"✅ Motif {'ajouté' if action == 'ajouter' else 'retiré'} : `{motif}`", ephemeral=True)
+
+@automod_group.command(name="limites", description="Régler l'anti-spam")
+@app_commands.describe(messages="Messages autorisés par fenêtre", secondes="Durée de la fenêtre", doublons="Messages identiques d'affilée tolérés", duree_mute="Durée du mute après récidive (ex: 10m)")
+@app_commands.checks.has_permissions(administrator=True)
+async def automod_limits(interaction: discord.Interaction, messages: app_commands.Range[int, 1, 50], secondes: app_commands.Range[float, 1, 600], doublons: app_commands.Range[int, 2, 20], duree_mute: str = "10m"):
+    if not parse_time(duree_mute):
+        return await interaction.response.send_message("❌ Durée invalide.", ephemeral=True)
+    await update_automod_rules(interaction.guild.id, rate=(messages, secondes), duplicates=doublons, mute_duration=duree_mute)
+    await interaction.response.send_message(f"✅ Anti-spam : {messages} messages / {secondes}s, {doublons} doublons, mute {duree_mute}", ephemeral=True)
+
+@automod_group.command(name="voir", description="Afficher les règles d'automod")
+@app_commands.checks.has_permissions(administrator=True)
+async def automod_show(interaction: discord.Interaction):
+    rules = automod_engine.rules(interaction.guild.id)
+    if not rules:
+        return await interaction.response.send_message("ℹ️ Automod désactivé sur ce serveur.", ephemeral=True)
+    embed = discord.Embed(title="🛡️ Automod", color=discord.Color.blurple())
+    embed.add_field(name="Mots interdits", value=str(len(rules["words"])))
+    embed.add_field(name="Regex", value="\n".join(f"`{p}`" for p in rules["regex"])[:1024] or "Aucune")
+    embed.add_field(name="Anti-spam", value=f"{rules['rate'][0]} messages / {rules['rate'][1]}s | {rules['duplicates']} doublons", inline=False)
+    embed.add_field(name="Mute après récidive", value=rules["mute_duration"])
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@automod_group.command(name="desactiver", description="Désactiver l'automod sur ce serveur")
+@app_commands.checks.has_permissions(administrator=True)
+async def automod_disable(interaction: discord.Interaction):
+    await guild_configs.update(interaction.guild.id, automod=None)
+    automod_engine.invalidate(interaction.guild.id)
+    await interaction.response.send_message("✅ Automod désactivé.", ephemeral=True)
+
+ext.add_command(automod_group)
+
+# ------------------ HISTORIQUE ------------------
+HISTORY_PAGE_SIZE = 10
+
+class HistoryView(metrics.InstrumentedView):
+    def __init__(self, guild_id: int, user: discord.User):
+        super().__init__(timeout=180)
+        self.guild_id = guild_id
+        self.user = user
+        # Curseur (id exclu) de chaque page visitée ; None = page la plus récente
+        self.cursors = [None]
+        self.next_cursor = None
+
+    async def render(self):
+        rows = await ledger.history(self.guild_id, self.user.id, before_id=self.cursors[-1], limit=HISTORY_PAGE_SIZE + 1)
+        has_next = len(rows) > HISTORY_PAGE_SIZE
+        rows = rows[:HISTORY_PAGE_SIZE]
+        self.next_cursor = rows[-1]["id"] if has_next else None
+        self.previous.disabled = len(self.cursors) == 1
+        self.next.disabled = not has_next
+        counts = await ledger.counts(self.guild_id, self.user.id)
+        summary = " | ".join(f"{action} : {n}" for action, n in sorted(counts.items())) or "Aucune sanction"
+        embed = discord.Embed(title=f"📜 Historique de {self.user}", description=summary, color=discord.Color.blurple())
+        for row in rows:
+            by = f"<@{row['moderator_id']}>" if row["moderator_id"] else "automatique"
+            details = f"<t:{int(row['created_at'])}:R> par {by}"
+            if row["duration"]: details += f" | Durée : {row['duration']}"
+            if row["reason"]: details += f"\nRaison : {row['reason']}"
+            embed.add_field(name=f"#{row['id']} — {row['action']}", value=details, inline=False)
+        embed.set_footer(text=f"Page {len(self.cursors)}")
+        return embed
+
+    @discord.ui.button(label="◀ Précédent", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.cursors.pop()
+        await interaction.response.edit_message(embed=await self.render(), view=self)
+
+    @discord.ui.button(label="Suivant ▶", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.cursors.append(self.next_cursor)
+        await interaction.response.edit_message(embed=await self.render(), view=self)
+
+@ext.command(name="history", description="Historique des sanctions d'un utilisateur")
+@app_commands.describe(user="Utilisateur")
+@app_commands.checks.has_permissions(kick_members=True)
+async def history(interaction: discord.Interaction, user: discord.User):
+    view = HistoryView(interaction.guild.id, user)
+    await interaction.response.send_message(embed=await view.render(), view=view, ephemeral=True)
+
+setup = ext.setup
+teardown = ext.teardown
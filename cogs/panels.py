@@ -0,0 +1,311 @@
+# Panels : panel staff des tickets (paginé, tenu à jour) et panel admin de
+# modération rapide.
+import discord
+from discord import app_commands
+import asyncio
+import dataclasses
+from itertools import islice
+import metrics
+import staff_logs
+from jobs import spawn
+from member_index import parse_user_id
+from guild_config import StaffPanelLocation
+from extensions import Extension
+from core import (bot, tickets, guild_configs, scheduler, ledger, member_index, send_staff_log, parse_time, archive_and_delete,
+                  check_staff_admin, get_or_create_mute_role, report_mute_role_setup, apply_mute, apply_warn)
+
+ext = Extension("panels")
+
+# ------------------ PANEL STAFF ------------------
+# Un message de panel persistant par serveur, paginé. Les boutons sont
+# enregistrés une seule fois au chargement (vue persistante + DynamicItem) et
+# seule la page affichée est re-rendue quand un ticket s'ouvre ou se ferme.
+STAFF_PANEL_PAGE_SIZE = 20
+STAFF_PANEL_REFRESH_DELAY = 2.0
+panel_refreshes = {}
+
+def render_staff_panel(guild: discord.Guild, page: int):
+    guild_tickets = tickets.for_guild(guild.id)
+    pages = max(1, -(-len(guild_tickets) // STAFF_PANEL_PAGE_SIZE))
+    page = min(max(page, 0), pages - 1)
+    start = page * STAFF_PANEL_PAGE_SIZE
+    entries = list(islice(guild_tickets.items(), start, start + STAFF_PANEL_PAGE_SIZE))
+    embed = discord.Embed(title="🎫 Panel staff — tickets ouverts", color=discord.Color.blurple())
+    embed.description = "\n".join(f"<#{ch_id}> — <@{info['user']}> — ouvert <t:{int(info['opened_at'])}:R>" for ch_id, info in entries) or "Aucun ticket ouvert."
+    embed.set_footer(text=f"Page {page + 1}/{pages} — {len(guild_tickets)} ticket(s)")
+    view = StaffPanel(page, pages)
+    for i, (ch_id, info) in enumerate(entries):
+        channel = guild.get_channel(int(ch_id))
+        view.add_item(CloseTicketButton(int(ch_id), label=channel.name if channel else f"Ticket {ch_id}", row=i // 5))
+    return page, embed, view
+
+@ext.dynamic_item
+class CloseTicketButton(discord.ui.DynamicItem[discord.ui.Button], template=r"ticket:close:(?P<channel_id>\d+)"):
+    def __init__(self, channel_id: int, label: str = "Fermer", row: int | None = None):
+        super().__init__(discord.ui.Button(label=f"🔒 {label}"[:80], style=discord.ButtonStyle.red, custom_id=f"ticket:close:{channel_id}"), row=row)
+        self.channel_id = channel_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["channel_id"]))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        metrics.track(type(self).__name__)
+        return await check_staff_admin(interaction)
+
+    async def callback(self, interaction: discord.Interaction):
+        ticket_info = await tickets.close(self.channel_id)
+        if ticket_info is None:
+            return await interaction.response.send_message("❌ Ticket déjà fermé ou inexistant.", ephemeral=True)
+        await interaction.response.send_message(f"✅ Ticket {self.channel_id} fermé par {interaction.user.mention}", ephemeral=True)
+        await send_staff_log(interaction.guild, "🔒 Ticket fermé via panel", f"Ticket {self.channel_id} fermé par {interaction.user.mention}")
+        channel = interaction.guild.get_channel(self.channel_id)
+        if channel:
+            await archive_and_delete(channel, ticket_info, interaction.user, f"Fermeture par staff {interaction.user}")
+
+class StaffPanel(metrics.InstrumentedView):
+    def __init__(self, page: int = 0, pages: int = 1):
+        super().__init__(timeout=None)
+        self.previous.disabled = page <= 0
+        self.next.disabled = page >= pages - 1
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await super().interaction_check(interaction) and await check_staff_admin(interaction)
+
+    async def show(self, interaction: discord.Interaction, page: int):
+        panel = guild_configs.config(interaction.guild.id).staff_panel or StaffPanelLocation(interaction.channel.id, interaction.message.id)
+        page, embed, view = render_staff_panel(interaction.guild, page)
+        await guild_configs.update(interaction.guild.id, staff_panel=dataclasses.replace(panel, page=page))
+        await interaction.response.edit_message(embed=embed, view=view)
+
+    def current_page(self, guild_id: int):
+        panel = guild_configs.config(guild_id).staff_panel
+        return panel.page if panel else 0
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary, custom_id="staffpanel:previous", row=4)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.current_page(interaction.guild.id) - 1)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary, custom_id="staffpanel:next", row=4)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.current_page(interaction.guild.id) + 1)
+
+    @discord.ui.button(label="Rafraîchir", style=discord.ButtonStyle.secondary, custom_id="staffpanel:refresh", row=4)
+    async def refresh(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.current_page(interaction.guild.id))
+
+async def refresh_staff_panel(guild_id: int):
+    # Regroupe les changements d'une rafale de tickets en une seule édition
+    await asyncio.sleep(STAFF_PANEL_REFRESH_DELAY)
+    panel = guild_configs.config(guild_id).staff_panel
+    guild = bot.get_guild(guild_id)
+    channel = guild.get_channel(panel.channel) if guild and panel else None
+    if not channel:
+        return
+    page, embed, view = render_staff_panel(guild, panel.page)
+    try:
+        await channel.get_partial_message(panel.message).edit(embed=embed, view=view)
+    except discord.NotFound:
+        await guild_configs.update(guild_id, staff_panel=None)
+
+def on_ticket_change(guild_id: int, index: int, opened: bool):
+    panel = guild_configs.config(guild_id).staff_panel
+    if not panel:
+        return
+    # Seule la page affichée compte : elle change si le ticket la précède ou y
+    # figure, ou si le nombre de pages change (boutons de navigation)
+    count = len(tickets.for_guild(guild_id))
+    pages_changed = count % STAFF_PANEL_PAGE_SIZE == (1 if opened else 0)
+    if index < (panel.page + 1) * STAFF_PANEL_PAGE_SIZE or pages_changed:
+        task = panel_refreshes.get(guild_id)
+        if task is None or task.done():
+            panel_refreshes[guild_id] = spawn(refresh_staff_panel(guild_id))
+
+@ext.on_load
+def watch_tickets():
+    # Boutons du panel staff enregistrés une fois pour toutes
+    bot.add_view(StaffPanel())
+    tickets.listeners.append(on_ticket_change)
+
+@ext.on_unload
+def unwatch_tickets():
+    tickets.listeners.remove(on_ticket_change)
+
+@ext.command(name="staffpanel", description="Publier le panel staff des tickets")
+@app_commands.describe(salon="Salon du panel (par défaut : ce salon)")
+@app_commands.checks.has_permissions(administrator=True)
+async def staffpanel(interaction: discord.Interaction, salon: discord.TextChannel | None = None):
+    salon = salon or interaction.channel
+    page, embed, view = render_staff_panel(interaction.guild, 0)
+    msg = await salon.send(embed=embed, view=view)
+    old = guild_configs.config(interaction.guild.id).staff_panel
+    await guild_configs.update(interaction.guild.id, staff_panel=StaffPanelLocation(salon.id, msg.id, page))
+    await interaction.response.send_message(f"✅ Panel staff publié dans {salon.mention}", ephemeral=True)
+    # L'ancien panel n'est plus tenu à jour : on le retire
+    old_channel = interaction.guild.get_channel(old.channel) if old else None
+    if old_channel:
+        try: await old_channel.get_partial_message(old.message).delete()
+        except discord.HTTPException: pass
+
+# ------------------ PANEL ADMIN COMMANDES ------------------
+# Cible introuvable : les noms proches sont proposés, jamais sanctionnés d'office
+async def member_not_found(inter: discord.Interaction, text: str):
+    candidates = member_index.suggest(inter.guild, text)
+    message = "❌ Utilisateur introuvable."
+    if candidates:
+        message += " Vouliez-vous dire :\n" + "\n".join(f"• {m.mention} (`{m.id}`)" for m in candidates)
+    await inter.response.send_message(message, ephemeral=True, allowed_mentions=discord.AllowedMentions.none())
+
+class AdminPanel(metrics.InstrumentedView):
+    # Le panel est public et n'expire pas : chaque bouton exige la permission
+    # de la commande équivalente
+    PERMISSIONS = {"ban_button": "ban_members", "unban_button": "ban_members", "mute_button": "manage_roles",
+                   "unmute_button": "manage_roles", "warn_button": "kick_members"}
+
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if not await super().interaction_check(interaction):
+            return False
+        custom_id, permissions = interaction.data.get("custom_id"), interaction.permissions
+        for name, permission in self.PERMISSIONS.items():
+            if getattr(self, name).custom_id == custom_id and (permissions.administrator or getattr(permissions, permission)):
+                return True
+        await interaction.response.send_message("❌ Vous n'avez pas la permission d'utiliser ce bouton.", ephemeral=True)
+        return False
+
+    # ------------------ BAN ------------------
+    @discord.ui.button(label="Ban", style=discord.ButtonStyle.danger, row=0)
+    async def ban_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        class BanModal(metrics.InstrumentedModal, title="Bannir un utilisateur"):
+            user = discord.ui.TextInput(label="Utilisateur (mention, ID ou pseudo)", required=True)
+            raison = discord.ui.TextInput(label="Raison (facultatif)", required=False)
+            temps = discord.ui.TextInput(label="Durée (facultatif, ex: 1d, 2h)", required=False)
+
+            async def on_submit(self, inter: discord.Interaction):
+                member = await member_index.lookup(inter.guild, self.user.value)
+                if not member:
+                    await member_not_found(inter, self.user.value)
+                    return
+                raison_text = self.raison.value or "Raison non donnée"
+                await member.ban(reason=raison_text)
+                ledger.record(inter.guild.id, member.id, inter.user.id, "ban", raison_text, self.temps.value or None)
+                embed = discord.Embed(title="⛔ Utilisateur banni", color=discord.Color.red())
+                embed.add_field(name="Utilisateur", value=member.mention)
+                embed.add_field(name="Par", value=inter.user.mention)
+                embed.add_field(name="Raison", value=raison_text)
+                await inter.response.send_message(embed=embed)
+                await send_staff_log(inter.guild, "⛔ Utilisateur banni", f"{member.mention} banni par {inter.user.mention} | Raison : {raison_text}", priority=staff_logs.HIGH)
+                # Ban temporaire si temps renseigné
+                seconds = parse_time(self.temps.value)
+                if seconds:
+                    await scheduler.schedule("unban", inter.guild.id, member.id, seconds, duration=self.temps.value)
+                else:
+                    await scheduler.cancel("unban", inter.guild.id, member.id)
+
+        await interaction.response.send_modal(BanModal())
+
+    # ------------------ MUTE ------------------
+    @discord.ui.button(label="Mute", style=discord.ButtonStyle.gray, row=0)
+    async def mute_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        class MuteModal(metrics.InstrumentedModal, title="Muter un utilisateur"):
+            user = discord.ui.TextInput(label="Utilisateur (mention, ID ou pseudo)", required=True)
+            temps = discord.ui.TextInput(label="Durée (obligatoire, ex: 10m, 1h)", required=True)
+            raison = discord.ui.TextInput(label="Raison (facultatif)", required=False)
+
+            async def on_submit(self, inter: discord.Interaction):
+                member = await member_index.lookup(inter.guild, self.user.value)
+                if not member:
+                    await member_not_found(inter, self.user.value)
+                    return
+                await apply_mute(inter.guild, member, inter.user, self.temps.value, self.raison.value or None)
+                embed = discord.Embed(title="🔇 Utilisateur muté", color=discord.Color.dark_gray())
+                embed.add_field(name="Utilisateur", value=member.mention)
+                embed.add_field(name="Par", value=inter.user.mention)
+                embed.add_field(name="Raison", value=self.raison.value or "Raison non donnée")
+                embed.add_field(name="Durée", value=self.temps.value)
+                await inter.response.send_message(embed=embed)
+                await report_mute_role_setup(inter)
+
+        await interaction.response.send_modal(MuteModal())
+
+    # ------------------ WARN ------------------
+    @discord.ui.button(label="Warn", style=discord.ButtonStyle.blurple, row=1)
+    async def warn_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        class WarnModal(metrics.InstrumentedModal, title="Avertir un utilisateur"):
+            user = discord.ui.TextInput(label="Utilisateur (mention, ID ou pseudo)", required=True)
+            raison = discord.ui.TextInput(label="Raison obligatoire", required=True)
+
+            async def on_submit(self, inter: discord.Interaction):
+                member = await member_index.lookup(inter.guild, self.user.value)
+                if not member:
+                    await member_not_found(inter, self.user.value)
+                    return
+                await apply_warn(inter.guild, member, inter.user, self.raison.value)
+                embed = discord.Embed(title="⚠️ Avertissement", color=discord.Color.yellow())
+                embed.add_field(name="Utilisateur", value=member.mention)
+                embed.add_field(name="Par", value=inter.user.mention)
+                embed.add_field(name="Raison", value=self.raison.value)
+                await inter.response.send_message(embed=embed)
+
+        await interaction.response.send_modal(WarnModal())
+
+    # ------------------ UNBAN ------------------
+    @discord.ui.button(label="Unban", style=discord.ButtonStyle.green, row=1)
+    async def unban_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        class UnbanModal(metrics.InstrumentedModal, title="Débannir un utilisateur"):
+            user = discord.ui.TextInput(label="Utilisateur (mention, ID ou pseudo)", required=True)
+
+            async def on_submit(self, inter: discord.Interaction):
+                user_obj = await member_index.resolve_banned(inter.guild, self.user.value)
+                if not user_obj:
+                    # Absent du cache : on tente quand même avec un ID brut
+                    user_id = parse_user_id(self.user.value)
+                    if user_id is None:
+                        await inter.response.send_message("❌ Utilisateur banni introuvable.", ephemeral=True)
+                        return
+                    user_obj = discord.Object(id=user_id)
+                await inter.guild.unban(user_obj, reason=f"Débanni par {inter.user}")
+                await scheduler.cancel("unban", inter.guild.id, user_obj.id)
+                ledger.record(inter.guild.id, user_obj.id, inter.user.id, "unban")
+                embed = discord.Embed(title="✅ Utilisateur débanni", color=discord.Color.green())
+                embed.add_field(name="Utilisateur", value=f"<@{user_obj.id}>")
+                embed.add_field(name="Par", value=inter.user.mention)
+                await inter.response.send_message(embed=embed)
+                await send_staff_log(inter.guild, "✅ Utilisateur débanni", f"<@{user_obj.id}> débanni par {inter.user.mention}")
+
+        await interaction.response.send_modal(UnbanModal())
+
+    # ------------------ UNMUTE ------------------
+    @discord.ui.button(label="Unmute", style=discord.ButtonStyle.green, row=1)
+    async def unmute_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        class UnmuteModal(metrics.InstrumentedModal, title="Unmute utilisateur"):
+            user = discord.ui.TextInput(label="Utilisateur (mention, ID ou pseudo)", required=True)
+
+            async def on_submit(self, inter: discord.Interaction):
+                member = await member_index.lookup(inter.guild, self.user.value)
+                if not member:
+                    await member_not_found(inter, self.user.value)
+                    return
+                mute_role = await get_or_create_mute_role(inter.guild)
+                await member.remove_roles(mute_role, reason=f"Unmute par {inter.user}")
+                await scheduler.cancel("unmute", inter.guild.id, member.id)
+                ledger.record(inter.guild.id, member.id, inter.user.id, "unmute")
+                embed = discord.Embed(title="✅ Utilisateur unmute", color=discord.Color.green())
+                embed.add_field(name="Utilisateur", value=member.mention)
+                embed.add_field(name="Par", value=inter.user.mention)
+                await inter.response.send_message(embed=embed)
+                await send_staff_log(inter.guild, "✅ Utilisateur unmute", f"{member.mention} unmute par {inter.user.mention}")
+
+        await interaction.response.send_modal(UnmuteModal())
+
+# ------------------ COMMANDE POUR OUVRIR LE PANEL ------------------
+@ext.command(name="adminpanel", description="Ouvre le panel admin pour modération rapide")
+@app_commands.checks.has_permissions(administrator=True)
+async def adminpanel(interaction: discord.Interaction):
+    embed = discord.Embed(title="🔧 Panel Admin", description="Utilisez les boutons ci-dessous pour exécuter des actions de modération", color=discord.Color.blurple())
+    await interaction.response.send_message(embed=embed, view=AdminPanel())
+
+setup = ext.setup
+teardown = ext.teardown
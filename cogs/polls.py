@@ -0,0 +1,162 @@
+# Sondages à boutons : un vote par membre, décompte tenu en mémoire, clôture
+# manuelle ou programmée.
+import discord
+from discord import app_commands
+import time
+import metrics
+import staff_logs
+from polls import Poll
+from extensions import Extension
+from core import bot, polls, scheduler, send_staff_log, parse_time, check_staff_admin
+
+ext = Extension("polls")
+
+# ------------------ POLL ------------------
+# Vote par boutons : un vote par membre, modifiable ; le décompte est tenu à
+# jour à chaque clic et le message n'est réédité que par intervalles
+def poll_embed(poll: Poll):
+    total = poll.voters
+    winners = poll.winners() if poll.closed else []
+    title = f"📊 Résultats : {poll.title}" if poll.closed else poll.title
+    description = poll.question
+    if poll.closes_at and not poll.closed:
+        description += f"\n\nClôture <t:{int(poll.closes_at)}:R>"
+    embed = discord.Embed(title=title[:256], description=description, color=discord.Color.dark_grey() if poll.closed else discord.Color.blurple())
+    for i, (option, count) in enumerate(zip(poll.options, poll.counts)):
+        share = count / total if total else 0
+        bar = "█" * round(share * 10) + "░" * (10 - round(share * 10))
+        embed.add_field(name=f"{'🏆 ' if i in winners else ''}{i + 1}. {option}"[:256], value=f"{bar} {count} ({share:.0%})", inline=False)
+    embed.set_footer(text=f"{total} votant(s)" + (" · Sondage clôturé" if poll.closed else ""))
+    return embed
+
+def poll_view(poll: Poll):
+    view = discord.ui.View(timeout=None)
+    for i, option in enumerate(poll.options):
+        view.add_item(PollButton(poll.id, i, option, row=i // 5))
+    view.add_item(ClosePollButton(poll.id, row=2))
+    if poll.closed:
+        for item in view.children:
+            item.disabled = True
+    return view
+
+async def render_poll(poll: Poll):
+    channel = bot.get_channel(poll.channel_id)
+    if channel is None or poll.message_id is None:
+        return
+    await channel.get_partial_message(poll.message_id).edit(embed=poll_embed(poll), view=poll_view(poll))
+
+async def close_poll(poll_id: int, closed_by=None):
+    try:
+        poll = await polls.finish(poll_id)
+    except discord.HTTPException:
+        # Message supprimé entre-temps : le sondage est tout de même clôturé
+        poll = None
+    if poll is None:
+        return None
+    guild = bot.get_guild(poll.guild_id)
+    if guild:
+        winners = ", ".join(poll.options[i] for i in poll.winners()) or "aucun vote"
+        by = f" par {closed_by.mention}" if closed_by else ""
+        await send_staff_log(guild, "📊 Sondage clôturé", f"« {poll.title} » clôturé{by} | {poll.voters} votant(s) | En tête : {winners}", priority=staff_logs.LOW)
+    return poll
+
+@scheduler.handler("close_poll")
+async def expire_poll(entry):
+    await close_poll(entry["poll"])
+
+@ext.dynamic_item
+class PollButton(discord.ui.DynamicItem[discord.ui.Button], template=r"poll:(?P<poll_id>\d+):(?P<option>\d+)"):
+    def __init__(self, poll_id: int, option: int, label: str = "Voter", row: int | None = None):
+        super().__init__(discord.ui.Button(label=f"{option + 1}. {label}"[:80], style=discord.ButtonStyle.blurple, custom_id=f"poll:{poll_id}:{option}"), row=row)
+        self.poll_id = poll_id
+        self.option = option
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["poll_id"]), int(match["option"]))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        metrics.track(type(self).__name__)
+        return True
+
+    async def callback(self, interaction: discord.Interaction):
+        poll = polls.get(self.poll_id)
+        if poll is None or self.option >= len(poll.options):
+            return await interaction.response.send_message("❌ Ce sondage est clôturé.", ephemeral=True)
+        previous = polls.vote(poll, interaction.user.id, self.option)
+        choice = poll.options[self.option]
+        if previous == self.option:
+            text = f"Vous avez déjà voté pour **{choice}**."
+        elif previous is None:
+            text = f"✅ Vote enregistré : **{choice}**"
+        else:
+            text = f"🔁 Vote modifié : **{poll.options[previous]}** → **{choice}**"
+        await interaction.response.send_message(text, ephemeral=True)
+
+@ext.dynamic_item
+class ClosePollButton(discord.ui.DynamicItem[discord.ui.Button], template=r"poll:(?P<poll_id>\d+):close"):
+    def __init__(self, poll_id: int, row: int | None = None):
+        super().__init__(discord.ui.Button(label="🔒 Clôturer", style=discord.ButtonStyle.grey, custom_id=f"poll:{poll_id}:close"), row=row)
+        self.poll_id = poll_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["poll_id"]))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        metrics.track(type(self).__name__)
+        poll = polls.get(self.poll_id)
+        if poll is None or interaction.user.id == poll.author_id:
+            return True
+        return await check_staff_admin(interaction)
+
+    async def callback(self, interaction: discord.Interaction):
+        poll = polls.get(self.poll_id)
+        if poll is None:
+            return await interaction.response.send_message("❌ Sondage déjà clôturé.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        await scheduler.cancel("close_poll", poll.guild_id, poll.id)
+        await close_poll(poll.id, interaction.user)
+        await interaction.followup.send("✅ Sondage clôturé.", ephemeral=True)
+
+@ext.command(name="poll", description="Créer un sondage")
+@app_commands.describe(salon="Salon obligatoire", mention="Mention facultative", duree="Clôture automatique après (ex: 30m, 2h, 1d)")
+@app_commands.checks.has_permissions(administrator=True)
+async def poll(interaction: discord.Interaction, salon: discord.TextChannel, mention: str | None = None, duree: str | None = None):
+    seconds = parse_time(duree) if duree else None
+    if duree and not seconds:
+        return await interaction.response.send_message("❌ Durée invalide.", ephemeral=True)
+
+    class PollModal(metrics.InstrumentedModal, title="Création de sondage"):
+        title_field = discord.ui.TextInput(label="Titre", required=True)
+        question_field = discord.ui.TextInput(label="Question", style=discord.TextStyle.paragraph, required=True)
+        options_field = discord.ui.TextInput(label="Options (séparées par |)", required=True)
+        async def on_submit(self, inter: discord.Interaction):
+            options = [opt.strip() for opt in self.options_field.value.split("|") if opt.strip()]
+            if len(options) < 2 or len(options) > 10:
+                await inter.response.send_message("❌ Le sondage doit avoir entre 2 et 10 options.", ephemeral=True)
+                return
+            # L'ID de l'interaction sert d'identifiant (boutons, base, planification)
+            new_poll = Poll(inter.id, inter.guild.id, salon.id, inter.user.id, self.title_field.value, self.question_field.value, options,
+                            closes_at=time.time() + seconds if seconds else None)
+            msg = await salon.send(content=mention or "", embed=poll_embed(new_poll), view=poll_view(new_poll))
+            new_poll.message_id = msg.id
+            polls.add(new_poll)
+            if seconds:
+                await scheduler.schedule("close_poll", inter.guild.id, new_poll.id, seconds, poll=new_poll.id)
+            await inter.response.send_message(f"✅ Sondage créé dans {salon.mention}", ephemeral=True)
+            await send_staff_log(inter.guild, "📊 Sondage créé", f"Sondage créé par {interaction.user.mention} dans {salon.mention}\nTitre : {self.title_field.value}", priority=staff_logs.LOW)
+
+    await interaction.response.send_modal(PollModal())
+
+# Le store réédite les messages de sondage avec le rendu de cette extension
+@ext.on_load
+def attach_renderer():
+    polls.render = render_poll
+
+@ext.on_unload
+def detach_renderer():
+    polls.render = None
+
+setup = ext.setup
+teardown = ext.teardown
@@ -0,0 +1,101 @@
+# Tickets : bouton d'ouverture persistant, configuration, fermeture et transcripts.
+import discord
+from discord import app_commands
+import os
+import metrics
+import staff_logs
+from guild_config import TicketSettings
+from extensions import Extension
+from core import (bot, tickets, guild_configs, transcript_archiver, ownership, send_staff_log, archive_and_delete,
+                  migrate_legacy_ticket_config)
+
+ext = Extension("tickets")
+
+# ------------------ TICKETS PERSISTANTS ------------------
+# Un seul custom_id pour tous les serveurs : la catégorie et le salon de logs
+# sont lus dans la configuration du serveur au moment du clic.
+class TicketButton(metrics.InstrumentedView):
+    def __init__(self, label: str = "Ouvrir un ticket"):
+        super().__init__(timeout=None)
+        self.open_ticket.label = label
+
+    @discord.ui.button(label="Ouvrir un ticket", style=discord.ButtonStyle.green, custom_id="ticket:open")
+    async def open_ticket(self, inter: discord.Interaction, button: discord.ui.Button):
+        settings = guild_configs.config(inter.guild.id).tickets
+        category = inter.guild.get_channel(settings.category) if settings else None
+        if not settings or not category:
+            return await inter.response.send_message("❌ Le système de tickets n'est pas configuré.", ephemeral=True)
+        overwrites = {
+            inter.guild.default_role: discord.PermissionOverwrite(read_messages=False),
+            inter.user: discord.PermissionOverwrite(read_messages=True, send_messages=True),
+            inter.guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True)
+        }
+        ticket_channel = await inter.guild.create_text_channel(f"ticket-{inter.user.name}", category=category, overwrites=overwrites)
+        await ticket_channel.send(f"🎫 Ticket ouvert pour {inter.user.mention}")
+        await tickets.open(ticket_channel.id, inter.user.id, inter.guild.id, settings.logs)
+        await inter.response.send_message(f"✅ Ticket créé : {ticket_channel.mention}", ephemeral=True)
+        await send_staff_log(inter.guild, "🎫 Ticket créé", f"{inter.user.mention} a ouvert un ticket : {ticket_channel.mention}", priority=staff_logs.LOW)
+
+def bind_ticket_views():
+    # Rattache le bouton de ticket au message publié par chaque serveur
+    for guild_id, config in guild_configs.configs.items():
+        if config.tickets and config.tickets.message:
+            bot.add_view(TicketButton(config.tickets.bouton), message_id=config.tickets.message)
+
+@ext.command(name="ticketsconfig", description="Configurer le système de tickets")
+@app_commands.describe(
+    salon="Salon où mettre le message de ticket",
+    titre="Titre",
+    description="Description",
+    bouton="Titre du bouton pour ouvrir le ticket",
+    logs="Salon pour validation",
+    category="Catégorie tickets"
+)
+@app_commands.checks.has_permissions(administrator=True)
+async def ticketsconfig(interaction: discord.Interaction, salon: discord.TextChannel, titre: str, description: str, bouton: str, logs: discord.TextChannel, category: discord.CategoryChannel):
+    embed = discord.Embed(title=titre, description=description, color=discord.Color.green())
+    view = TicketButton(bouton)
+    msg = await salon.send(embed=embed, view=view)
+    settings = TicketSettings(salon=salon.id, titre=titre, description=description, bouton=bouton, logs=logs.id, category=category.id, message=msg.id)
+    await guild_configs.update(interaction.guild.id, tickets=settings)
+    bot.add_view(view, message_id=msg.id)
+    await interaction.response.send_message(f"✅ Configuration du ticket appliquée dans {salon.mention}", ephemeral=True)
+
+# ------------------ FERMER UN TICKET ------------------
+@ext.command(name="close_ticket", description="Fermer un ticket")
+@app_commands.checks.has_permissions(administrator=True)
+async def close_ticket(interaction: discord.Interaction):
+    ticket_info = await tickets.close(interaction.channel.id)
+    if ticket_info is None:
+        return await interaction.response.send_message("❌ Ce salon n'est pas un ticket.", ephemeral=True)
+    await interaction.response.send_message("🔒 Ticket fermé. Archivage puis suppression du salon...", ephemeral=True)
+    await send_staff_log(interaction.guild, "🔒 Ticket fermé", f"Ticket {interaction.channel.mention} fermé par {interaction.user.mention}")
+    await archive_and_delete(interaction.channel, ticket_info, interaction.user, f"Ticket fermé par {interaction.user}")
+
+@ext.command(name="transcript", description="Retrouver les transcripts de tickets")
+@app_commands.describe(utilisateur="Lister les tickets archivés d'un utilisateur", ticket="ID du ticket à télécharger")
+@app_commands.checks.has_permissions(administrator=True)
+async def transcript(interaction: discord.Interaction, utilisateur: discord.User | None = None, ticket: str | None = None):
+    if ticket:
+        row = await transcript_archiver.get(interaction.guild.id, int(ticket)) if ticket.isdigit() else None
+        if not row:
+            return await interaction.response.send_message("❌ Transcript introuvable.", ephemeral=True)
+        if os.path.getsize(row["path"]) > interaction.guild.filesize_limit:
+            return await interaction.response.send_message(f"❌ Transcript trop volumineux pour Discord : `{row['path']}`", ephemeral=True)
+        return await interaction.response.send_message(f"🗄️ Ticket {ticket} — {row['messages']} message(s)", file=discord.File(row["path"]), ephemeral=True)
+    if utilisateur:
+        rows = await transcript_archiver.for_user(interaction.guild.id, utilisateur.id)
+        lines = [f"`{r['ticket_id']}` — fermé <t:{int(r['closed_at'])}:R> — {r['messages']} message(s)" for r in rows]
+        embed = discord.Embed(title=f"🗄️ Tickets archivés de {utilisateur}", description="\n".join(lines) or "Aucun ticket archivé.", color=discord.Color.blurple())
+        return await interaction.response.send_message(embed=embed, ephemeral=True)
+    await interaction.response.send_message("❌ Indiquez un utilisateur ou un ID de ticket.", ephemeral=True)
+
+# ------------------ DÉMARRAGE ------------------
+@ext.on_ready
+async def restore_tickets():
+    await migrate_legacy_ticket_config()
+    bind_ticket_views()
+    await tickets.repair(bot.get_channel, forget_missing=not ownership.partial)
+
+setup = ext.setup
+teardown = ext.teardown
@@ -0,0 +1,37 @@
+import hashlib
+import json
+import logging
+import discord
+from discord import app_commands
+from storage import load_json, atomic_write_json
+
+log = logging.getLogger(__name__)
+
+
+def tree_hash(tree: app_commands.CommandTree, guild=None):
+    # Empreinte du payload exact envoyé par tree.sync() (ordre des clés figé)
+    payload = [command.to_dict(tree) for command in tree.get_commands(guild=guild)]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+# ------------------ SYNCHRONISATION DES COMMANDES ------------------
+# tree.sync() est un appel REST global fortement limité : on ne le fait que si
+# l'arbre a changé depuis la dernière synchronisation réussie. Les empreintes
+# sont rangées par application (et par serveur pour une synchro de dev).
+async def sync_if_changed(tree: app_commands.CommandTree, path, guild_id=None):
+    application_id = tree.client.application_id
+    guild = discord.Object(guild_id) if guild_id else None
+    if guild is not None:
+        # Serveur de dev : les commandes globales y sont copiées et apparaissent immédiatement
+        tree.copy_global_to(guild=guild)
+    key = f"{application_id}:{guild_id}" if guild_id else str(application_id)
+    hashes = load_json(path)
+    digest = tree_hash(tree, guild)
+    if hashes.get(key) == digest:
+        log.info("Commandes inchangées, synchronisation ignorée")
+        return False
+    synced = await tree.sync(guild=guild)
+    hashes[key] = digest
+    atomic_write_json(path, hashes)
+    log.info("%d commande(s) synchronisée(s)%s", len(synced), f" sur le serveur {guild_id}" if guild_id else "")
+    return True
@@ -0,0 +1,330 @@
+# Services partagés par les extensions (cogs/) : configuration, bot, stockage,
+# files d'attente et chemins communs de sanction. Ce module ne déclare aucune
+# commande ; il n'est jamais rechargé, les extensions si (voir extensions.py).
+import discord
+from discord.ext import commands
+import os
+import dataclasses
+import sqlite3
+from dotenv import load_dotenv
+from storage import load_json, TicketStore, SqliteTable
+from scheduler import ExpiryScheduler
+from jobs import BulkJob, report_progress, spawn, background_tasks
+from polls import PollStore
+import staff_logs
+from webhooks import WebhookCache
+from member_index import MemberIndex
+from infractions import InfractionLedger
+import automod
+import metrics
+from health import HealthServer
+from transcripts import TranscriptArchiver
+from sharding import ShardOwnership, parse_shard_ids
+from cache_policy import CachePolicy, ActiveMembers
+from extensions import ExtensionLoader
+from guild_config import GuildConfigStore, TicketSettings, StaffPanelLocation, AutoModRules, build_section
+
+load_dotenv()
+TOKEN = os.getenv("DISCORD_TOKEN")
+# Serveur de dev : les commandes y sont synchronisées au lieu de globalement
+DEV_GUILD_ID = int(os.getenv("DEV_GUILD_ID", "0")) or None
+HEALTH_HOST = os.getenv("HEALTH_HOST", "0.0.0.0")
+HEALTH_PORT = int(os.getenv("HEALTH_PORT", "8080"))
+# /status et /metrics : écoute locale, séparée de la page de santé publique
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+# Sharding : SHARD_COUNT (nombre ou « auto ») et SHARD_IDS (ex. « 0-3 ») pour
+# ne lancer qu'une partie des shards dans ce processus (voir launcher.py)
+SHARD_COUNT = os.getenv("SHARD_COUNT", "")
+SHARD_IDS = parse_shard_ids(os.getenv("SHARD_IDS", ""))
+# Base partagée par les processus quand les shards sont répartis
+SHARED_STATE_FILE = os.getenv("SHARED_STATE_FILE", "shared_state.db")
+# Extensions chargées au démarrage (toutes par défaut), ex. « moderation,tickets »
+ALL_EXTENSIONS = ("moderation", "tickets", "embeds", "polls", "panels")
+EXTENSIONS = [name.strip() for name in os.getenv("EXTENSIONS", ",".join(ALL_EXTENSIONS)).split(",") if name.strip()]
+
+intents = discord.Intents.default()
+intents.members = True
+intents.message_content = True
+# Cache des membres et des messages : MEMBER_CACHE=active pour ne garder que le
+# staff et les membres actifs (voir cache_policy.py)
+cache_policy = CachePolicy.from_env()
+
+# Arbre de commandes et session HTTP instrumentés (latences, appels REST, 429)
+bot_options = dict(command_prefix="?", intents=intents, tree_cls=metrics.InstrumentedTree, http_trace=metrics.http_trace(),
+                   **cache_policy.client_options(intents))
+if SHARD_COUNT or SHARD_IDS is not None:
+    shard_count = None if SHARD_COUNT in ("", "auto") else int(SHARD_COUNT)
+    bot = commands.AutoShardedBot(shard_count=shard_count, shard_ids=SHARD_IDS, **bot_options)
+else:
+    bot = commands.Bot(**bot_options)
+# Serveurs gérés par ce processus (tous, sauf si SHARD_IDS est défini)
+ownership = ShardOwnership(bot.shard_count, SHARD_IDS)
+
+GUILDS_FILE = "guilds_config.json"
+TICKETS_FILE = "tickets_data.json"
+SCHEDULE_FILE = "scheduled_expiries.json"
+LEDGER_FILE = "infractions.db"
+POLLS_FILE = "polls.db"
+TRANSCRIPTS_DIR = "transcripts"
+COMMAND_SYNC_FILE = "command_sync.json"
+# Anciens fichiers, repris dans GUILDS_FILE au premier démarrage
+LEGACY_TICKETS_CONFIG_FILE = "tickets_config.json"
+LEGACY_AUTOMOD_FILE = "automod_rules.json"
+LEGACY_STAFF_PANELS_FILE = "staff_panels.json"
+
+# Shards répartis entre processus : configuration, tickets et fins de sanctions
+# passent par une base SQLite commune (les anciens fichiers JSON y sont importés
+# une fois) ; chaque processus n'y écrit que les clés qu'il a modifiées
+def shared_backend(namespace, legacy):
+    return SqliteTable(SHARED_STATE_FILE, namespace, legacy=legacy) if ownership.partial else None
+
+# Configuration par serveur (tickets, logs, rôle Muted, automod, panel staff)
+guild_configs = GuildConfigStore(GUILDS_FILE, backend=shared_backend("guilds", GUILDS_FILE))
+# Tickets ouverts : gardés en mémoire, écrits sur disque en différé
+tickets = TicketStore(TICKETS_FILE, backend=shared_backend("tickets", TICKETS_FILE))
+# Fins de ban / mute temporaires, persistées pour survivre aux redémarrages ;
+# chaque processus ne planifie que celles de ses serveurs
+scheduler = ExpiryScheduler(SCHEDULE_FILE, backend=shared_backend("expiries", SCHEDULE_FILE), owns=ownership.owns)
+# Staff logs regroupés par paquets de 10 embeds par message
+staff_log_queue = staff_logs.StaffLogQueue(configured_channel=lambda guild_id: guild_configs.config(guild_id).log_channel_id)
+# Session HTTP partagée et webhooks déjà parsés
+webhook_cache = WebhookCache()
+# Index des membres et des bannis pour les modals du panel admin
+member_index = MemberIndex()
+# Membres actifs gardés en cache (MEMBER_CACHE=active), les autres en sont retirés
+active_members = ActiveMembers(cache_policy, on_evict=member_index.remove)
+# Historique des sanctions (SQLite)
+ledger = InfractionLedger(LEDGER_FILE)
+# Sondages ouverts et votes (SQLite), message réédité au plus toutes les 10 s ;
+# le rendu est fourni par l'extension polls
+polls = PollStore(POLLS_FILE)
+# Transcripts des tickets fermés (JSONL compressé + index SQLite)
+transcript_archiver = TranscriptArchiver(TRANSCRIPTS_DIR)
+# Extensions du dossier cogs/, chargées en parallèle pendant la connexion
+loader = ExtensionLoader(bot, "cogs", EXTENSIONS)
+
+# Santé, état et métriques servis sur la boucle du bot
+def bot_status():
+    return {
+        "scheduled_expiries": scheduler.pending(),
+        "open_tickets": len(tickets),
+        "queues": {
+            "staff_logs": staff_log_queue.depth(),
+            "ledger": ledger.pending(),
+            "polls": polls.pending(),
+            "background_tasks": len(background_tasks),
+        },
+        "extensions": loader.status(),
+    }
+
+# /readyz attend aussi que les extensions soient chargées et prêtes
+health_server = HealthServer(bot, HEALTH_HOST, HEALTH_PORT, status=bot_status, ready=loader.ready,
+                             metrics_host=METRICS_HOST, metrics_port=METRICS_PORT)
+
+# Latence de chaque shard de ce processus
+def shard_latencies():
+    return [((str(shard["id"] or 0),), shard["latency"]) for shard in health_server.shards() if shard["latency"] is not None]
+
+metrics.registry.register(metrics.Gauge("bot_shard_latency_seconds", "Latence du heartbeat de la gateway par shard", shard_latencies, labels=("shard",)))
+
+# Moteur d'automod, alimenté par les règles de la configuration du serveur
+def automod_rules_for(guild_id):
+    rules = guild_configs.config(guild_id).automod
+    return dataclasses.asdict(rules) if rules else None
+
+automod_engine = automod.AutoMod(automod_rules_for)
+
+# ------------------ STAFF LOGS ------------------
+def get_staff_log_channel(guild: discord.Guild):
+    return staff_log_queue.resolve_channel(guild)
+
+async def send_staff_log(guild: discord.Guild, title: str, description: str, color=discord.Color.blue(), priority=staff_logs.NORMAL):
+    # N'attend jamais l'envoi : l'embed est mis en file et envoyé par paquets
+    embed = discord.Embed(title=title, description=description, color=color, timestamp=discord.utils.utcnow())
+    staff_log_queue.enqueue(guild, embed, priority)
+
+@bot.event
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+    staff_log_queue.invalidate(channel.guild.id)
+
+@bot.event
+async def on_guild_channel_update(before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+    if before.name != after.name:
+        staff_log_queue.invalidate(after.guild.id)
+
+@bot.event
+async def on_guild_channel_create(channel: discord.abc.GuildChannel):
+    if channel.name == staff_log_queue.channel_name:
+        staff_log_queue.invalidate(channel.guild.id)
+
+# ------------------ TIME PARSER ------------------
+def parse_time(timestr: str):
+    if not timestr: return None
+    unit = timestr[-1]
+    try: amount = int(timestr[:-1])
+    except: return None
+    if unit == "s": return amount
+    if unit == "m": return amount*60
+    if unit == "h": return amount*3600
+    if unit == "d": return amount*86400
+    return None
+
+# ------------------ RÔLE MUTED ------------------
+# Configuration des permissions en cours, par serveur
+mute_role_jobs = {}
+
+def mute_overwrite_missing(channel, role):
+    overwrite = channel.overwrites_for(role)
+    return overwrite.send_messages is not False or overwrite.add_reactions is not False
+
+async def apply_mute_overwrite(channel, role):
+    await channel.set_permissions(role, send_messages=False, add_reactions=False)
+
+def provision_mute_role(guild: discord.Guild, role: discord.Role):
+    # Les permissions sont posées en arrière-plan, plusieurs salons à la fois
+    job = mute_role_jobs.get(guild.id)
+    if job and not job.finished:
+        return job
+    channels = [c for c in guild.channels if mute_overwrite_missing(c, role)]
+    job = BulkJob("Configuration du rôle Muted", channels, lambda c: apply_mute_overwrite(c, role)).start()
+    mute_role_jobs[guild.id] = job
+    return job
+
+def get_mute_role(guild: discord.Guild):
+    role = guild.get_role(guild_configs.config(guild.id).mute_role_id or 0)
+    return role or discord.utils.get(guild.roles, name="Muted")
+
+async def get_or_create_mute_role(guild: discord.Guild):
+    role = get_mute_role(guild)
+    if not role:
+        role = await guild.create_role(name="Muted", permissions=discord.Permissions(send_messages=False))
+        provision_mute_role(guild, role)
+    if guild_configs.config(guild.id).mute_role_id != role.id:
+        await guild_configs.update(guild.id, mute_role_id=role.id)
+    return role
+
+async def report_mute_role_setup(interaction: discord.Interaction):
+    # Informe le modérateur si le rôle Muted est encore en cours de configuration
+    job = mute_role_jobs.get(interaction.guild.id)
+    if not job or job.finished:
+        return
+    msg = await interaction.followup.send(job.progress_text(), ephemeral=True, wait=True)
+    spawn(report_progress(job, msg.edit))
+
+# ------------------ ARCHIVAGE DES TICKETS ------------------
+async def archive_and_delete(channel: discord.TextChannel, ticket_info: dict, closed_by: discord.abc.User, reason: str):
+    # Le salon n'est supprimé qu'une fois son historique archivé ; en cas
+    # d'échec il redevient un ticket ouvert, que le staff peut refermer
+    try:
+        path, count = await transcript_archiver.archive(channel, ticket_info, closed_by)
+    except (discord.HTTPException, OSError, sqlite3.Error):
+        await tickets.restore(channel.id, ticket_info)
+        await send_staff_log(channel.guild, "❌ Archivage impossible", f"Le transcript de {channel.mention} n'a pas pu être enregistré : le salon est conservé et le ticket reste ouvert.", color=discord.Color.red(), priority=staff_logs.HIGH)
+        return False
+    await send_staff_log(channel.guild, "🗄️ Ticket archivé", f"`{channel.name}` : {count} message(s) archivé(s) (ticket {channel.id})", priority=staff_logs.LOW)
+    await channel.delete(reason=reason)
+    return True
+
+# ------------------ ACCÈS STAFF ------------------
+async def check_staff_admin(interaction: discord.Interaction) -> bool:
+    is_admin = any(role.permissions.administrator for role in interaction.user.roles)
+    if not is_admin:
+        await interaction.response.send_message("❌ Vous n'avez pas accès au panel staff.", ephemeral=True)
+        return False
+    return True
+
+# ------------------ SANCTIONS ------------------
+# Chemins communs aux commandes, au panel admin et à l'automod
+async def apply_mute(guild: discord.Guild, member: discord.Member, moderator, temps: str, raison: str | None = None, log: bool = True):
+    mute_role = await get_or_create_mute_role(guild)
+    await member.add_roles(mute_role, reason=raison or "Raison non donnée")
+    ledger.record(guild.id, member.id, moderator.id, "mute", raison, temps)
+    if log:
+        await send_staff_log(guild, "🔇 Utilisateur muté", f"{member.mention} mute par {moderator.mention} | Durée : {temps} | Raison : {raison or 'Raison non donnée'}", priority=staff_logs.HIGH)
+    seconds = parse_time(temps)
+    if seconds:
+        await scheduler.schedule("unmute", guild.id, member.id, seconds, role=mute_role.id, duration=temps)
+    return mute_role
+
+async def apply_warn(guild: discord.Guild, member: discord.Member, moderator, raison: str):
+    ledger.record(guild.id, member.id, moderator.id, "warn", raison)
+    await send_staff_log(guild, "⚠️ Avertissement", f"{member.mention} averti par {moderator.mention} | Raison : {raison}")
+
+# ------------------ INDEX DES MEMBRES ------------------
+@bot.event
+async def on_guild_available(guild: discord.Guild):
+    member_index.build(guild)
+
+@bot.event
+async def on_guild_join(guild: discord.Guild):
+    member_index.build(guild)
+
+@bot.event
+async def on_guild_remove(guild: discord.Guild):
+    member_index.forget(guild.id)
+    active_members.forget(guild.id)
+
+@bot.event
+async def on_interaction(interaction: discord.Interaction):
+    active_members.touch(interaction.user)
+
+@bot.event
+async def on_message(message: discord.Message):
+    # L'automod écoute aussi on_message (extension moderation)
+    if message.guild is not None and not message.author.bot:
+        active_members.touch(message.author)
+    await bot.process_commands(message)
+
+@bot.event
+async def on_member_join(member: discord.Member):
+    member_index.add(member)
+
+@bot.event
+async def on_member_remove(member: discord.Member):
+    member_index.remove(member)
+
+@bot.event
+async def on_member_update(before: discord.Member, after: discord.Member):
+    if before.nick != after.nick:
+        member_index.add(after)
+
+@bot.event
+async def on_user_update(before: discord.User, after: discord.User):
+    if before.name != after.name or before.global_name != after.global_name:
+        member_index.update_user(after, after.mutual_guilds)
+
+@bot.event
+async def on_member_ban(guild: discord.Guild, user: discord.User):
+    member_index.banned(guild.id, user)
+
+@bot.event
+async def on_member_unban(guild: discord.Guild, user: discord.User):
+    member_index.unbanned(guild.id, user.id)
+    # Débannissement depuis le client Discord : la fin programmée n'a plus lieu d'être
+    await scheduler.cancel("unban", guild.id, user.id)
+
+# ------------------ MIGRATION ------------------
+def retire_legacy_file(path):
+    # Plusieurs processus peuvent migrer en même temps : le premier renomme
+    try:
+        os.replace(path, path + ".migrated")
+    except FileNotFoundError:
+        pass
+
+async def migrate_legacy_files():
+    # Règles d'automod et panels staff : déjà indexés par serveur
+    for path, section, cls in ((LEGACY_AUTOMOD_FILE, "automod", AutoModRules), (LEGACY_STAFF_PANELS_FILE, "staff_panel", StaffPanelLocation)):
+        for guild_id, data in load_json(path).items():
+            await guild_configs.update(int(guild_id), **{section: build_section(cls, data)})
+        retire_legacy_file(path)
+
+async def migrate_legacy_ticket_config():
+    # L'ancienne configuration globale est rattachée au serveur de son salon
+    legacy = load_json(LEGACY_TICKETS_CONFIG_FILE)
+    channel = bot.get_channel(legacy.get("salon", 0)) if legacy else None
+    if channel and not guild_configs.config(channel.guild.id).tickets:
+        await guild_configs.update(channel.guild.id, tickets=build_section(TicketSettings, legacy))
+    # Salon introuvable : il peut appartenir aux shards d'un autre processus
+    if legacy and (channel or not ownership.partial):
+        retire_legacy_file(LEGACY_TICKETS_CONFIG_FILE)
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from discord import app_commands
+
+log = logging.getLogger(__name__)
+
+# Temps de chargement de chaque extension : « import » (exécution du module et
+# enregistrement) et « ready » (tâches de démarrage une fois la gateway prête)
+timings = {}
+
+
+# ------------------ EXTENSION ------------------
+# Une extension déclare ses commandes, écouteurs, boutons dynamiques et tâches
+# de démarrage au lieu de les poser directement sur le bot : setup() les
+# ajoute, teardown() les retire. Recharger le module remplace donc le code
+# sans toucher à la connexion à la gateway ni aux services partagés (core.py).
+# Chaque module expose `setup = ext.setup` et `teardown = ext.teardown`.
+class Extension:
+    def __init__(self, name):
+        self.name = name
+        self.commands = []
+        self.listeners = []
+        self.dynamic_items = []
+        self.load_hooks = []
+        self.unload_hooks = []
+        self.ready_hooks = []
+        self._ready_task = None
+
+    # ---- Déclarations ----
+    def command(self, **kwargs):
+        # Comme bot.tree.command
+        def decorator(func):
+            command = app_commands.command(**kwargs)(func)
+            self.commands.append(command)
+            return command
+        return decorator
+
+    def add_command(self, command):
+        # Groupes de commandes (app_commands.Group)
+        self.commands.append(command)
+        return command
+
+    def listen(self, name=None):
+        # Comme bot.listen : plusieurs extensions peuvent écouter le même événement
+        def decorator(func):
+            self.listeners.append((func, name or func.__name__))
+            return func
+        return decorator
+
+    def dynamic_item(self, cls):
+        self.dynamic_items.append(cls)
+        return cls
+
+    def on_load(self, func):
+        self.load_hooks.append(func)
+        return func
+
+    def on_unload(self, func):
+        self.unload_hooks.append(func)
+        return func
+
+    def on_ready(self, func):
+        # Lancé une fois la gateway prête, au démarrage comme après un rechargement
+        self.ready_hooks.append(func)
+        return func
+
+    # ---- Chargement ----
+    async def setup(self, bot):
+        for command in self.commands:
+            bot.tree.add_command(command, override=True)
+        for func, name in self.listeners:
+            bot.add_listener(func, name)
+        if self.dynamic_items:
+            bot.add_dynamic_items(*self.dynamic_items)
+        for hook in self.load_hooks:
+            hook()
+        self._ready_task = asyncio.create_task(self._run_ready_hooks(bot))
+
+    async def teardown(self, bot):
+        if self._ready_task is not None:
+            self._ready_task.cancel()
+        for hook in self.unload_hooks:
+            hook()
+        if self.dynamic_items:
+            bot.remove_dynamic_items(*self.dynamic_items)
+        for func, name in self.listeners:
+            bot.remove_listener(func, name)
+        for command in self.commands:
+            bot.tree.remove_command(command.name)
+
+    async def _run_ready_hooks(self, bot):
+        await bot.wait_until_ready()
+        start = time.perf_counter()
+        for hook in self.ready_hooks:
+            try:
+                await hook()
+            except Exception:
+                log.exception("Extension %s : échec d'une tâche de démarrage", self.name)
+        timing = timings.setdefault(self.name, {"import": None})
+        timing["ready"] = time.perf_counter() - start
+        log.info("Extension %s prête (import %.0f ms, démarrage %.0f ms)", self.name, (timing["import"] or 0) * 1000, timing["ready"] * 1000)
+
+
+# ------------------ CHARGEUR ------------------
+# Les extensions sont chargées en tâche de fond pendant la connexion à la
+# gateway (et non avant), toutes en même temps : une extension en échec
+# n'empêche pas les autres de se charger.
+class ExtensionLoader:
+    def __init__(self, bot, package, names):
+        self.bot = bot
+        self.package = package
+        self.names = list(names)
+        self.loaded = asyncio.Event()
+        self.failed = {}
+
+    def module(self, name):
+        return f"{self.package}.{name}"
+
+    async def _timed(self, name, load):
+        timing = timings[name] = {"import": None, "ready": None}
+        start = time.perf_counter()
+        await load(self.module(name))
+        timing["import"] = time.perf_counter() - start
+        return timing
+
+    async def load(self, name):
+        try:
+            await self._timed(name, self.bot.load_extension)
+            self.failed.pop(name, None)
+        except Exception as e:
+            self.failed[name] = str(e)
+            log.exception("Extension %s : chargement impossible", name)
+
+    async def load_all(self):
+        start = time.perf_counter()
+        await asyncio.gather(*(self.load(name) for name in self.names))
+        self.loaded.set()
+        log.info("%d extension(s) chargée(s) en %.0f ms", len(self.names) - len(self.failed), (time.perf_counter() - start) * 1000)
+
+    async def reload(self, name):
+        # Extension non chargée (désactivée ou en échec) : simple chargement
+        load = self.bot.reload_extension if self.module(name) in self.bot.extensions else self.bot.load_extension
+        timing = await self._timed(name, load)
+        self.failed.pop(name, None)
+        if name not in self.names:
+            self.names.append(name)
+        return timing
+
+    def ready(self):
+        return self.loaded.is_set() and all(timings.get(name, {}).get("ready") is not None for name in self.names if name not in self.failed)
+
+    def status(self):
+        return {
+            name: {"loaded": self.module(name) in self.bot.extensions, "error": self.failed.get(name), **timings.get(name, {})}
+            for name in self.names
+        }
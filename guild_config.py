@@ -0,0 +1,90 @@
+from dataclasses import dataclass, asdict, fields, replace
+from storage import JsonStore
+
+
+# ------------------ SCHÉMA ------------------
+# Configuration typée par serveur. Les objets sont immuables : toute
+# modification passe par GuildConfigStore.update(), qui remplace l'objet en
+# mémoire et programme l'écriture sur disque.
+@dataclass(frozen=True)
+class TicketSettings:
+    salon: int
+    titre: str
+    description: str
+    bouton: str
+    logs: int
+    category: int
+    message: int | None = None
+
+
+@dataclass(frozen=True)
+class StaffPanelLocation:
+    channel: int
+    message: int
+    page: int = 0
+
+
+@dataclass(frozen=True)
+class AutoModRules:
+    words: tuple = ()
+    regex: tuple = ()
+    rate: tuple = (5, 5.0)
+    duplicates: int = 3
+    escalation: tuple = (3, 600.0)
+    mute_duration: str = "10m"
+
+
+@dataclass(frozen=True)
+class GuildConfig:
+    tickets: TicketSettings | None = None
+    log_channel_id: int | None = None
+    mute_role_id: int | None = None
+    automod: AutoModRules | None = None
+    staff_panel: StaffPanelLocation | None = None
+
+
+SECTIONS = {"tickets": TicketSettings, "automod": AutoModRules, "staff_panel": StaffPanelLocation}
+
+
+def build_section(cls, data):
+    # Ignore les clés inconnues ; les listes JSON redeviennent des tuples
+    known = {f.name for f in fields(cls)}
+    return cls(**{k: tuple(v) if isinstance(v, list) else v for k, v in data.items() if k in known})
+
+
+def config_from_json(data):
+    values = {}
+    for f in fields(GuildConfig):
+        if f.name not in data:
+            continue
+        value = data[f.name]
+        if f.name in SECTIONS and value is not None:
+            value = build_section(SECTIONS[f.name], value)
+        values[f.name] = value
+    return GuildConfig(**values)
+
+
+EMPTY_CONFIG = GuildConfig()
+
+
+# ------------------ STORE ------------------
+# Chargé une fois au démarrage : les handlers lisent la map en mémoire et ne
+# touchent jamais le disque ; les écritures sont atomiques et différées.
+class GuildConfigStore(JsonStore):
+    def __init__(self, path, flush_delay=1.0, backend=None):
+        super().__init__(path, flush_delay, backend)
+        self.configs = {}
+
+    def load(self):
+        super().load()
+        self.configs = {int(guild_id): config_from_json(data) for guild_id, data in self.data.items()}
+        return self
+
+    def config(self, guild_id) -> GuildConfig:
+        return self.configs.get(guild_id, EMPTY_CONFIG)
+
+    async def update(self, guild_id, **changes) -> GuildConfig:
+        config = replace(self.config(guild_id), **changes)
+        self.configs[guild_id] = config
+        await self.set(guild_id, asdict(config))
+        return config
@@ -0,0 +1,174 @@
+import math
+import time
+from collections import Counter
+import discord
+from aiohttp import web
+import metrics
+
+
+def gateways(bot):
+    # (shard_id, websocket) de chaque connexion à la gateway ; shard_id vaut
+    # None pour un bot non shardé
+    if isinstance(bot, discord.AutoShardedClient):
+        return [(shard_id, info._parent.ws) for shard_id, info in sorted(bot.shards.items())]
+    return [(None, bot.ws)]
+
+
+def heartbeat_age(ws):
+    # Temps écoulé depuis le dernier ACK de heartbeat de la gateway. discord.py
+    # ne l'expose pas publiquement : None tant qu'aucune connexion n'est active.
+    keep_alive = getattr(ws, "_keep_alive", None)
+    if keep_alive is None:
+        return None
+    return time.perf_counter() - keep_alive._last_ack
+
+
+def finite(value):
+    return value if value is not None and math.isfinite(value) else None
+
+
+# ------------------ SANTÉ ET MÉTRIQUES ------------------
+# Serveur aiohttp sur la boucle du bot (pas de thread, pas de WSGI). Toutes
+# les réponses sont calculées à partir de l'état en mémoire : on peut les
+# interroger chaque seconde sans effet sur le bot.
+# Sur host:port (public, services de ping et sondes) :
+#   /         compatibilité avec les services de ping (« Bot is running! »)
+#   /livez    200 si chaque shard répond (ou se reconnecte depuis peu), sinon 503
+#   /readyz   200 une fois le cache des serveurs (et `ready()` s'il est donné) prêt, sinon 503
+# Sur metrics_host:metrics_port (local par défaut) :
+#   /status   état détaillé en JSON
+#   /metrics  métriques au format Prometheus
+class HealthServer:
+    def __init__(self, bot, host="0.0.0.0", port=8080, status=None, ready=None, metrics_host="127.0.0.1", metrics_port=9100,
+                 max_heartbeat_age=90.0, max_reconnect=300.0):
+        # status() -> dict d'informations ajoutées à /status (files, planificateur...)
+        # ready() -> bool, condition supplémentaire de /readyz (extensions chargées...)
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.metrics_host = metrics_host
+        self.metrics_port = metrics_port
+        self.status = status
+        self.ready_check = ready
+        self.max_heartbeat_age = max_heartbeat_age
+        self.max_reconnect = max_reconnect
+        self.started_at = time.monotonic()
+        # Par shard (None hors sharding) : début de la déconnexion en cours
+        self.disconnected_since = {}
+        self.connected = set()
+        self.runners = []
+        if isinstance(bot, discord.AutoShardedClient):
+            bot.add_listener(self._on_connect, "on_shard_connect")
+            bot.add_listener(self._on_connect, "on_shard_resumed")
+            bot.add_listener(self._on_disconnect, "on_shard_disconnect")
+        else:
+            bot.add_listener(self._on_connect, "on_connect")
+            bot.add_listener(self._on_connect, "on_resumed")
+            bot.add_listener(self._on_disconnect, "on_disconnect")
+
+    async def _on_connect(self, shard_id=None):
+        self.connected.add(shard_id)
+        self.disconnected_since.pop(shard_id, None)
+
+    async def _on_disconnect(self, shard_id=None):
+        self.connected.discard(shard_id)
+        self.disconnected_since.setdefault(shard_id, time.monotonic())
+
+    async def start(self):
+        public = web.Application()
+        public.router.add_get("/", self.home)
+        public.router.add_get("/livez", self.livez)
+        public.router.add_get("/readyz", self.readyz)
+        # État interne (files, serveurs, rate limits) : jamais sur l'écoute publique
+        private = web.Application()
+        private.router.add_get("/status", self.status_json)
+        private.router.add_get("/metrics", metrics.handle_metrics)
+        await self._serve(public, self.host, self.port)
+        await self._serve(private, self.metrics_host, self.metrics_port)
+        return self
+
+    async def _serve(self, app, host, port):
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        self.runners.append(runner)
+        await web.TCPSite(runner, host, port).start()
+
+    async def close(self):
+        while self.runners:
+            await self.runners.pop().cleanup()
+
+    # ---- État ----
+    def live(self):
+        now = time.monotonic()
+        if not self.connected and not self.disconnected_since:
+            # Première connexion pas encore établie
+            return now - self.started_at < self.max_reconnect
+        if any(now - since >= self.max_reconnect for since in self.disconnected_since.values()):
+            return False
+        for shard_id, ws in gateways(self.bot):
+            if shard_id in self.connected:
+                age = heartbeat_age(ws)
+                if age is not None and age >= self.max_heartbeat_age:
+                    return False
+        return True
+
+    def ready(self):
+        if self.ready_check is not None and not self.ready_check():
+            return False
+        return self.bot.is_ready() and not self.bot.is_closed()
+
+    def shards(self):
+        # Latence, heartbeat et nombre de serveurs de chaque shard de ce processus
+        now = time.monotonic()
+        guilds = Counter(guild.shard_id for guild in self.bot.guilds)
+        latencies = dict(self.bot.latencies) if isinstance(self.bot, discord.AutoShardedClient) else {None: self.bot.latency}
+        result = []
+        for shard_id, ws in gateways(self.bot):
+            since = self.disconnected_since.get(shard_id)
+            result.append({
+                "id": shard_id,
+                "connected": shard_id in self.connected,
+                "disconnected_for": now - since if since is not None else None,
+                "latency": finite(latencies.get(shard_id)),
+                "heartbeat_age": heartbeat_age(ws),
+                "guilds": guilds[shard_id or 0],
+            })
+        return result
+
+    def snapshot(self):
+        now = time.monotonic()
+        rate_limit = dict(metrics.rate_limit_state)
+        rate_limit["seconds_ago"] = time.time() - rate_limit["last_at"] if rate_limit["last_at"] else None
+        shards = self.shards()
+        since = min(self.disconnected_since.values(), default=None)
+        data = {
+            "live": self.live(),
+            "ready": self.ready(),
+            "uptime": now - self.started_at,
+            "disconnected_for": now - since if since is not None else None,
+            "latency": finite(self.bot.latency),
+            "heartbeat_age": max((s["heartbeat_age"] for s in shards if s["heartbeat_age"] is not None), default=None),
+            "guilds": len(self.bot.guilds),
+            "shard_count": self.bot.shard_count,
+            "shards": shards,
+            "loop_lag": dict(metrics.loop_lag),
+            "rate_limit": rate_limit,
+        }
+        if self.status is not None:
+            data.update(self.status())
+        return data
+
+    # ---- Routes ----
+    async def home(self, request):
+        return web.Response(text="Bot is running!")
+
+    async def livez(self, request):
+        live = self.live()
+        return web.Response(text="ok" if live else "gateway unresponsive", status=200 if live else 503)
+
+    async def readyz(self, request):
+        ready = self.ready()
+        return web.Response(text="ok" if ready else "not ready", status=200 if ready else 503)
+
+    async def status_json(self, request):
+        return web.json_response(self.snapshot())
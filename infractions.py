@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from storage import connect
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS infractions (
+    id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    moderator_id INTEGER,
+    action TEXT NOT NULL,
+    reason TEXT,
+    duration TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_infractions_guild_user ON infractions (guild_id, user_id, id);
+CREATE INDEX IF NOT EXISTS idx_infractions_created ON infractions (created_at);
+"""
+
+
+# ------------------ REGISTRE DES SANCTIONS ------------------
+# Base SQLite locale en WAL. Les écritures passent par une file : les
+# commandes n'attendent jamais le disque, un worker insère par lots dans un
+# thread dédié. Les lectures ont leur propre thread et leur propre connexion,
+# et ne sont donc pas bloquées par les écritures.
+class InfractionLedger:
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self.queue = asyncio.Queue()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ledger-write")
+        self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ledger-read")
+        self._write_conn = None
+        self._read_conn = None
+        self._task = None
+
+    async def _run(self, executor, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+    async def open(self):
+        if self._task is not None:
+            return self
+        await self._run(self._writer, self._open_writer)
+        await self._run(self._reader, self._open_reader)
+        self._task = asyncio.create_task(self._write_loop())
+        return self
+
+    def _open_writer(self):
+        self._write_conn = connect(self.path)
+        self._write_conn.executescript(SCHEMA)
+
+    def _open_reader(self):
+        self._read_conn = connect(self.path)
+
+    async def close(self):
+        if self._task is None:
+            return
+        self.queue.put_nowait(None)
+        await self._task
+        self._task = None
+        await self._run(self._writer, self._write_conn.close)
+        await self._run(self._reader, self._read_conn.close)
+        self._writer.shutdown()
+        self._reader.shutdown()
+
+    # ---- Écriture ----
+    def record(self, guild_id, user_id, moderator_id, action, reason=None, duration=None):
+        self.queue.put_nowait((guild_id, user_id, moderator_id, action, reason, duration, time.time()))
+
+    def pending(self):
+        return self.queue.qsize()
+
+    async def _write_loop(self):
+        stop = False
+        while not stop:
+            batch = [await self.queue.get()]
+            while not self.queue.empty() and len(batch) < self.batch_size:
+                batch.append(self.queue.get_nowait())
+            if None in batch:
+                stop = True
+                batch = [row for row in batch if row is not None]
+            if not batch:
+                continue
+            try:
+                await self._run(self._writer, self._insert, batch)
+            except sqlite3.Error:
+                log.exception("Écriture de %d sanction(s) impossible", len(batch))
+
+    def _insert(self, rows):
+        with self._write_conn:
+            self._write_conn.executemany(
+                "INSERT INTO infractions (guild_id, user_id, moderator_id, action, reason, duration, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    # ---- Lecture ----
+    async def history(self, guild_id, user_id, before_id=None, limit=10):
+        # Pagination par curseur (id) : chaque page est une lecture d'index bornée
+        return await self._run(self._reader, self._history, guild_id, user_id, before_id, limit)
+
+    def _history(self, guild_id, user_id, before_id, limit):
+        query = "SELECT * FROM infractions WHERE guild_id = ? AND user_id = ?"
+        params = [guild_id, user_id]
+        if before_id is not None:
+            query += " AND id < ?"
+            params.append(before_id)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._read_conn.execute(query, params)]
+
+    async def counts(self, guild_id, user_id):
+        return await self._run(self._reader, self._counts, guild_id, user_id)
+
+    def _counts(self, guild_id, user_id):
+        rows = self._read_conn.execute(
+            "SELECT action, COUNT(*) FROM infractions WHERE guild_id = ? AND user_id = ? GROUP BY action",
+            (guild_id, user_id),
+        )
+        return {action: count for action, count in rows}
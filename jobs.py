@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import time
+import discord
+
+log = logging.getLogger(__name__)
+
+# Statuts pour lesquels un nouvel essai a du sens (rate limit, erreurs serveur)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+async def with_retry(call, attempts=4, base_delay=1.0):
+    # discord.py respecte déjà les buckets de rate limit et rejoue les 429 ;
+    # on ajoute un backoff exponentiel pour les cas où il abandonne.
+    for attempt in range(attempts):
+        try:
+            return await call()
+        except discord.HTTPException as e:
+            if e.status not in RETRY_STATUSES or attempt == attempts - 1:
+                raise
+            await asyncio.sleep(base_delay * 2 ** attempt)
+
+
+# ------------------ JOBS EN ARRIÈRE-PLAN ------------------
+# Applique `action` à chaque élément avec au plus `concurrency` appels REST
+# en vol. Les workers consomment une file : la mémoire reste bornée même pour
+# des milliers d'éléments, et les appels vers des routes différentes (un salon,
+# un membre...) tombent dans des buckets distincts et avancent en parallèle.
+# `weight(item)` permet de compter un élément comme plusieurs unités (un lot
+# d'IDs par exemple) ; l'action peut alors retourner le nombre d'unités en échec.
+class BulkJob:
+    def __init__(self, name, items, action, concurrency=5, weight=None):
+        self.name = name
+        self.items = list(items)
+        self.action = action
+        self.concurrency = concurrency
+        self.weight = weight or (lambda item: 1)
+        self.total = sum(self.weight(item) for item in self.items)
+        self.done = 0
+        self.failed = 0
+        self.started_at = None
+        self.finished_at = None
+        self.task = None
+
+    @property
+    def finished(self):
+        return self.task is not None and self.task.done()
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+        return self
+
+    async def wait(self):
+        return await self.start().task
+
+    async def run(self):
+        self.started_at = time.monotonic()
+        queue = asyncio.Queue()
+        for item in self.items:
+            queue.put_nowait(item)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(min(self.concurrency, self.total))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for w in workers:
+                w.cancel()
+            self.finished_at = time.monotonic()
+        return self
+
+    async def _worker(self, queue):
+        while not queue.empty():
+            item = queue.get_nowait()
+            units = self.weight(item)
+            try:
+                failed = await with_retry(lambda: self.action(item))
+                failed = failed if isinstance(failed, int) else 0
+                self.done += units - failed
+                self.failed += failed
+            except Exception:
+                self.failed += units
+                log.exception("%s : échec pour %r", self.name, item)
+
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def progress_text(self):
+        state = "✅ Terminé" if self.finished else "⏳ En cours"
+        text = f"{state} — {self.name} : {self.done + self.failed}/{self.total} ({self.elapsed():.1f}s)"
+        if self.failed:
+            text += f" | ❌ {self.failed} échec(s)"
+        return text
+
+
+# Garde une référence sur les tâches lancées en arrière-plan (sinon le GC peut
+# les collecter avant la fin)
+background_tasks = set()
+
+
+def spawn(coro):
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+
+async def report_progress(job, edit, interval=2.0):
+    # Met à jour un message de suivi toutes les `interval` secondes jusqu'à la fin
+    while True:
+        if not job.finished:
+            await asyncio.wait({job.task}, timeout=interval)
+        try:
+            await edit(content=job.progress_text())
+        except discord.HTTPException:
+            return
+        if job.finished:
+            return
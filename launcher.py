@@ -0,0 +1,87 @@
+# Lancement multi-processus : les shards du bot sont répartis entre plusieurs
+# processus ModeratorBot.py (une plage de shards chacun), relancés s'ils s'arrêtent.
+# Usage : python launcher.py --processes 4 [--shards 16 | --shards auto]
+# Chaque processus sert sa page de santé sur HEALTH_PORT + son numéro et ses
+# métriques sur METRICS_PORT + son numéro.
+import argparse
+import asyncio
+import logging
+import math
+import os
+import signal
+import sys
+from dotenv import load_dotenv
+from sharding import format_shard_ids, split_shards, recommended_shards
+
+BOT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ModeratorBot.py")
+# Discord n'accepte qu'un IDENTIFY toutes les 5 secondes par groupe de concurrence
+IDENTIFY_INTERVAL = 5.5
+
+log = logging.getLogger("launcher")
+
+
+# ------------------ WORKER ------------------
+class Worker:
+    def __init__(self, index, shard_ids, shard_count, health_port, metrics_port):
+        self.index = index
+        self.shard_ids = shard_ids
+        self.env = dict(os.environ, SHARD_COUNT=str(shard_count), SHARD_IDS=format_shard_ids(shard_ids),
+                        HEALTH_PORT=str(health_port + index), METRICS_PORT=str(metrics_port + index))
+        self.process = None
+        self.stopping = False
+
+    async def run(self, delay):
+        # Relance le processus avec un délai croissant s'il s'arrête tout seul
+        await asyncio.sleep(delay)
+        backoff = 1.0
+        while not self.stopping:
+            log.info("Processus %d : shards %s", self.index, self.env["SHARD_IDS"])
+            self.process = await asyncio.create_subprocess_exec(sys.executable, BOT_SCRIPT, env=self.env)
+            code = await self.process.wait()
+            if self.stopping:
+                break
+            log.warning("Processus %d arrêté (code %s), relance dans %.0f s", self.index, code, backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+
+    def stop(self):
+        self.stopping = True
+        if self.process is not None and self.process.returncode is None:
+            self.process.terminate()
+
+
+# ------------------ LANCEMENT ------------------
+async def main():
+    parser = argparse.ArgumentParser(description="Lance ModeratorBot sur plusieurs processus")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="nombre de processus")
+    parser.add_argument("--shards", default="auto", help="nombre total de shards, ou « auto » (recommandation de Discord)")
+    parser.add_argument("--health-port", type=int, default=int(os.getenv("HEALTH_PORT", "8080")), help="port du premier processus")
+    parser.add_argument("--metrics-port", type=int, default=int(os.getenv("METRICS_PORT", "9100")), help="port des métriques du premier processus")
+    args = parser.parse_args()
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    max_concurrency = 1
+    if args.shards == "auto":
+        shard_count, max_concurrency = await recommended_shards(os.getenv("DISCORD_TOKEN"))
+    else:
+        shard_count = int(args.shards)
+    ranges = split_shards(shard_count, args.processes)
+    log.info("%d shard(s) répartis sur %d processus", shard_count, len(ranges))
+
+    workers = [Worker(i, shard_ids, shard_count, args.health_port, args.metrics_port) for i, shard_ids in enumerate(ranges)]
+    # Démarrages décalés : un processus identifie ses shards avant que le suivant commence
+    delays, delay = [], 0.0
+    for worker in workers:
+        delays.append(delay)
+        delay += IDENTIFY_INTERVAL * math.ceil(len(worker.shard_ids) / max_concurrency)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: [worker.stop() for worker in workers])
+    tasks = [asyncio.create_task(worker.run(d)) for worker, d in zip(workers, delays)]
+    await asyncio.gather(*tasks)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,226 @@
+import asyncio
+import difflib
+import re
+import discord
+
+MENTION_RE = re.compile(r"^<@!?(\d+)>$")
+
+
+def parse_user_id(text: str):
+    # Accepte une mention <@id> / <@!id> ou un ID brut
+    text = text.strip()
+    match = MENTION_RE.match(text)
+    if match:
+        return int(match.group(1))
+    if text.isdigit():
+        return int(text)
+    return None
+
+
+def member_names(member):
+    names = {member.name, member.global_name, member.nick}
+    return {n.lower() for n in names if n}
+
+
+# ------------------ TRIE ------------------
+# Arbre de préfixes sur les noms en minuscules ; chaque nœud terminal garde
+# l'ensemble des IDs qui portent ce nom.
+class Trie:
+    END = "$"
+
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, word, value):
+        node = self.root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node.setdefault(self.END, set()).add(value)
+
+    def remove(self, word, value):
+        path, node = [], self.root
+        for ch in word:
+            if ch not in node:
+                return
+            path.append((node, ch))
+            node = node[ch]
+        values = node.get(self.END)
+        if not values:
+            return
+        values.discard(value)
+        if not values:
+            del node[self.END]
+        # Élague les branches devenues vides
+        for parent, ch in reversed(path):
+            if parent[ch]:
+                break
+            del parent[ch]
+
+    def words(self, prefix, limit=25):
+        node = self.root
+        for ch in prefix:
+            if ch not in node:
+                return []
+            node = node[ch]
+        found, stack = [], [(prefix, node)]
+        while stack and len(found) < limit:
+            word, node = stack.pop()
+            if self.END in node:
+                found.append(word)
+            for ch, child in node.items():
+                if ch != self.END:
+                    stack.append((word + ch, child))
+        return found
+
+    def values(self, word):
+        node = self.root
+        for ch in word:
+            if ch not in node:
+                return set()
+            node = node[ch]
+        return node.get(self.END, set())
+
+
+# ------------------ INDEX PAR SERVEUR ------------------
+class GuildMemberIndex:
+    def __init__(self):
+        self.trie = Trie()
+        self.names = {}
+
+    def add(self, member):
+        self.remove(member.id)
+        names = member_names(member)
+        self.names[member.id] = names
+        for name in names:
+            self.trie.insert(name, member.id)
+
+    def remove(self, member_id):
+        for name in self.names.pop(member_id, ()):
+            self.trie.remove(name, member_id)
+
+    def exact(self, name):
+        return self.trie.values(name.lower())
+
+    def prefix(self, name, limit=25):
+        ids = set()
+        for word in self.trie.words(name.lower(), limit):
+            ids |= self.trie.values(word)
+        return ids
+
+    def fuzzy(self, name, limit=5):
+        # Candidats restreints aux noms qui partagent les deux premières lettres
+        name = name.lower()
+        candidates = self.trie.words(name[:2], limit=500)
+        ids = set()
+        for match in difflib.get_close_matches(name, candidates, n=limit, cutoff=0.8):
+            ids |= self.trie.values(match)
+        return ids
+
+
+# ------------------ RÉSOLUTION DES MEMBRES ------------------
+# Index tenu à jour par les événements de membres : mention, ID, pseudo ou
+# surnom sont résolus sans parcourir guild.members. Une sanction ne vise que
+# ce qui correspond exactement ; les noms proches (préfixe, faute de frappe)
+# ne sont que proposés. Les bannis sont gardés en cache pour éviter un appel
+# REST à chaque débannissement.
+class MemberIndex:
+    def __init__(self):
+        self.guilds = {}
+        self.bans = {}
+
+    def build(self, guild: discord.Guild):
+        index = GuildMemberIndex()
+        for member in guild.members:
+            index.add(member)
+        self.guilds[guild.id] = index
+        return index
+
+    async def build_all(self, guilds):
+        for guild in guilds:
+            if guild.id not in self.guilds:
+                self.build(guild)
+                await asyncio.sleep(0)
+
+    def forget(self, guild_id):
+        self.guilds.pop(guild_id, None)
+        self.bans.pop(guild_id, None)
+
+    def _index(self, guild):
+        index = self.guilds.get(guild.id)
+        return index if index is not None else self.build(guild)
+
+    # ---- Événements ----
+    def add(self, member: discord.Member):
+        self._index(member.guild).add(member)
+
+    def remove(self, member: discord.Member):
+        self._index(member.guild).remove(member.id)
+
+    def update_user(self, user: discord.User, guilds):
+        for guild in guilds:
+            member = guild.get_member(user.id)
+            if member:
+                self.add(member)
+
+    def banned(self, guild_id, user):
+        bans = self.bans.get(guild_id)
+        if bans is not None:
+            bans[user.id] = user
+
+    def unbanned(self, guild_id, user_id):
+        bans = self.bans.get(guild_id)
+        if bans is not None:
+            bans.pop(user_id, None)
+
+    # ---- Recherche ----
+    def resolve(self, guild: discord.Guild, text: str):
+        user_id = parse_user_id(text)
+        if user_id is not None:
+            return guild.get_member(user_id)
+        name = text.strip().lstrip("@")
+        if not name:
+            return None
+        # Nom exact uniquement : un seul candidat sinon rien
+        ids = self._index(guild).exact(name)
+        return guild.get_member(next(iter(ids))) if len(ids) == 1 else None
+
+    def suggest(self, guild: discord.Guild, text: str, limit=5):
+        # Membres au nom proche, à proposer quand lookup ne trouve rien :
+        # homonymes, puis noms commençant par le texte, puis fautes de frappe
+        name = text.strip().lstrip("@")
+        if not name or parse_user_id(text) is not None:
+            return []
+        index = self._index(guild)
+        ids = index.exact(name) or index.prefix(name) or index.fuzzy(name, limit)
+        members = [m for m in map(guild.get_member, ids) if m is not None]
+        return sorted(members, key=lambda m: m.name)[:limit]
+
+    async def lookup(self, guild: discord.Guild, text: str):
+        # Comme resolve, mais demande à la gateway les membres absents du cache
+        # quand le serveur n'est pas entièrement en cache (chunk paresseux)
+        member = self.resolve(guild, text)
+        if member is not None or guild.chunked:
+            return member
+        user_id = parse_user_id(text)
+        name = text.strip().lstrip("@").lower()
+        if user_id is not None:
+            found = await guild.query_members(user_ids=[user_id], cache=True)
+        elif name:
+            found = [m for m in await guild.query_members(query=name, limit=5, cache=True) if name in member_names(m)]
+        else:
+            return None
+        for m in found:
+            self.add(m)
+        return found[0] if len(found) == 1 else None
+
+    async def resolve_banned(self, guild: discord.Guild, text: str):
+        bans = self.bans.get(guild.id)
+        if bans is None:
+            bans = {entry.user.id: entry.user async for entry in guild.bans(limit=None)}
+            self.bans[guild.id] = bans
+        user_id = parse_user_id(text)
+        if user_id is not None:
+            return bans.get(user_id)
+        name = text.strip().lstrip("@").lower()
+        matches = [u for u in bans.values() if name in (u.name.lower(), (u.global_name or "").lower())]
+        return matches[0] if len(matches) == 1 else None
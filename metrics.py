@@ -0,0 +1,250 @@
+import asyncio
+import contextvars
+import time
+from array import array
+from bisect import bisect_left
+import aiohttp
+import discord
+from discord import app_commands
+from aiohttp import web
+
+# Bornes (en secondes) des histogrammes de latence
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+# ------------------ MÉTRIQUES ------------------
+# L'enregistrement ne fait qu'incrémenter des compteurs en mémoire ; le texte
+# au format Prometheus n'est construit qu'au moment d'un scrape. Sans scrape,
+# le coût se limite à quelques additions par interaction.
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield self.name, format_labels(self.labels, labels), value
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name, help, func, labels=()):
+        # func() est appelée à chaque scrape : la valeur n'est jamais maintenue.
+        # Avec des labels, func() renvoie des couples (valeurs des labels, valeur).
+        self.name = name
+        self.help = help
+        self.func = func
+        self.labels = labels
+
+    def samples(self):
+        if not self.labels:
+            yield self.name, "", self.func()
+            return
+        for labels, value in self.func():
+            yield self.name, format_labels(self.labels, labels), value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, value, *labels):
+        series = self.series.get(labels)
+        if series is None:
+            # Compteurs par tranche (non cumulés) + total et nombre d'observations
+            series = self.series[labels] = [array("q", [0] * (len(self.buckets) + 1)), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self):
+        for labels, (counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets + ("+Inf",), counts):
+                cumulative += n
+                yield f"{self.name}_bucket", format_labels(self.labels + ("le",), labels + (bound,)), cumulative
+            yield f"{self.name}_sum", format_labels(self.labels, labels), total
+            yield f"{self.name}_count", format_labels(self.labels, labels), count
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name}{labels} {value}" for name, labels, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+FIRST_RESPONSE = registry.register(Histogram("bot_interaction_first_response_seconds", "Délai avant la première réponse (ou defer) à une interaction", ("handler",)))
+HANDLER_DURATION = registry.register(Histogram("bot_interaction_duration_seconds", "Durée totale du handler d'une interaction", ("handler",)))
+HANDLER_REST = registry.register(Histogram("bot_interaction_rest_seconds", "Temps passé par le handler à attendre des appels REST", ("handler",)))
+UNANSWERED = registry.register(Counter("bot_interaction_unanswered_total", "Interactions terminées sans réponse envoyée par le handler", ("handler",)))
+REST_REQUESTS = registry.register(Counter("bot_rest_requests_total", "Requêtes REST envoyées, par classe de statut", ("status",)))
+RATE_LIMITED = registry.register(Counter("bot_rate_limited_total", "Réponses 429 reçues, par portée de rate limit", ("scope",)))
+LOOP_LAG = registry.register(Histogram("bot_event_loop_lag_seconds", "Retard de la boucle d'événements sur un sleep programmé", buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)))
+
+# Dernier rate limit rencontré (exposé tel quel par l'état du bot)
+rate_limit_state = {"hits": 0, "last_at": None, "scope": None, "retry_after": None, "global": False}
+loop_lag = {"last": 0.0, "max": 0.0}
+
+registry.register(Gauge("bot_event_loop_lag_last_seconds", "Dernier retard mesuré de la boucle d'événements", lambda: loop_lag["last"]))
+
+
+# ------------------ SUIVI DES INTERACTIONS ------------------
+# Le suivi démarre dans interaction_check, qui s'exécute dans la tâche même du
+# handler : la mesure est rattachée à cette tâche via un contextvar, et se
+# termine quand la tâche se termine. Les appels REST faits par cette tâche
+# (vus par le TraceConfig aiohttp) sont additionnés à la mesure en cours.
+current = contextvars.ContextVar("interaction_timing", default=None)
+# Appelés avec chaque mesure terminée (benchmarks, journalisation...)
+listeners = []
+
+
+class InteractionTiming:
+    __slots__ = ("handler", "task", "start", "first_response", "rest")
+
+    def __init__(self, handler, task):
+        self.handler = handler
+        self.task = task
+        self.start = time.perf_counter()
+        self.first_response = None
+        self.rest = 0.0
+
+
+def track(handler):
+    task = asyncio.current_task()
+    timing = current.get()
+    if task is None or (timing is not None and timing.task is task):
+        return
+    timing = InteractionTiming(handler, task)
+    current.set(timing)
+    task.add_done_callback(lambda _: finish(timing))
+
+
+def finish(timing):
+    HANDLER_DURATION.observe(time.perf_counter() - timing.start, timing.handler)
+    HANDLER_REST.observe(timing.rest, timing.handler)
+    if timing.first_response is None:
+        UNANSWERED.inc(timing.handler)
+    else:
+        FIRST_RESPONSE.observe(timing.first_response, timing.handler)
+    for listener in listeners:
+        listener(timing)
+
+
+def component_name(view, interaction: discord.Interaction):
+    # Nom stable pour un bouton : classe de la vue + nom de la méthode appelée
+    custom_id = (interaction.data or {}).get("custom_id")
+    for item in view.children:
+        if getattr(item, "custom_id", None) == custom_id:
+            callback = getattr(item.callback, "callback", item.callback)
+            return f"{type(view).__name__}.{getattr(callback, '__name__', type(item).__name__)}"
+    return type(view).__name__
+
+
+class InstrumentedTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.type is discord.InteractionType.application_command:
+            command = interaction.command
+            track(f"/{command.qualified_name}" if command else f"/{interaction.data.get('name')}")
+        return True
+
+
+class InstrumentedView(discord.ui.View):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        track(component_name(self, interaction))
+        return True
+
+
+class InstrumentedModal(discord.ui.Modal):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        track(type(self).__name__)
+        return True
+
+
+# ------------------ APPELS REST ------------------
+async def on_request_start(session, ctx, params):
+    ctx.start = time.perf_counter()
+
+
+async def on_request_end(session, ctx, params):
+    now = time.perf_counter()
+    status = params.response.status
+    REST_REQUESTS.inc(f"{status // 100}xx")
+    if status == 429:
+        headers = params.response.headers
+        scope = headers.get("X-RateLimit-Scope", "unknown")
+        RATE_LIMITED.inc(scope)
+        rate_limit_state["hits"] += 1
+        rate_limit_state["last_at"] = time.time()
+        rate_limit_state["scope"] = scope
+        rate_limit_state["retry_after"] = headers.get("Retry-After")
+        rate_limit_state["global"] = headers.get("X-RateLimit-Global") == "true"
+    timing = current.get()
+    # Seuls les appels attendus par le handler lui-même comptent (pas ceux des tâches qu'il lance)
+    if timing is None or timing.task is not asyncio.current_task():
+        return
+    timing.rest += now - ctx.start
+    if timing.first_response is None and params.url.path.endswith("/callback") and "/interactions/" in params.url.path:
+        timing.first_response = now - timing.start
+
+
+def http_trace():
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    return trace
+
+
+# ------------------ BOUCLE D'ÉVÉNEMENTS ------------------
+async def watch_loop_lag(interval=0.5):
+    # Un sleep qui se réveille en retard = la boucle était occupée ailleurs
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(loop.time() - start - interval, 0.0)
+        LOOP_LAG.observe(lag)
+        loop_lag["last"] = lag
+        loop_lag["max"] = max(loop_lag["max"], lag)
+
+
+# ------------------ EXPORT ------------------
+async def handle_metrics(request):
+    return web.Response(body=registry.render().encode(), headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from storage import connect
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS polls (
+    id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER,
+    author_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    question TEXT NOT NULL,
+    options TEXT NOT NULL,
+    closes_at REAL,
+    closed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS poll_votes (
+    poll_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    option INTEGER NOT NULL,
+    PRIMARY KEY (poll_id, user_id)
+) WITHOUT ROWID;
+"""
+
+
+class Poll:
+    # Un vote par utilisateur (user_id -> option) et le décompte par option,
+    # tenu à jour à chaque vote : rien n'est recompté au rendu
+    __slots__ = ("id", "guild_id", "channel_id", "message_id", "author_id", "title", "question", "options", "closes_at", "closed", "votes", "counts")
+
+    def __init__(self, id, guild_id, channel_id, author_id, title, question, options, closes_at=None, message_id=None, closed=False):
+        self.id = id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.author_id = author_id
+        self.title = title
+        self.question = question
+        self.options = options
+        self.closes_at = closes_at
+        self.closed = closed
+        self.votes = {}
+        self.counts = [0] * len(options)
+
+    @property
+    def voters(self):
+        return len(self.votes)
+
+    def vote(self, user_id, option):
+        # Retourne l'option précédente (None pour un premier vote)
+        previous = self.votes.get(user_id)
+        if previous != option:
+            if previous is not None:
+                self.counts[previous] -= 1
+            self.counts[option] += 1
+            self.votes[user_id] = option
+        return previous
+
+    def winners(self):
+        best = max(self.counts)
+        return [i for i, n in enumerate(self.counts) if n == best] if best else []
+
+    def row(self):
+        return (self.id, self.guild_id, self.channel_id, self.message_id, self.author_id, self.title, self.question,
+                json.dumps(self.options), self.closes_at, int(self.closed))
+
+
+# ------------------ SONDAGES ------------------
+# Sondages ouverts gardés en mémoire ; chaque vote est O(1) (dictionnaire et
+# compteurs) et part dans une file écrite par lots dans SQLite, comme le
+# registre des sanctions. Le message du sondage n'est réédité qu'au plus une
+# fois toutes les `edit_interval` secondes, quel que soit le nombre de votes :
+# `render(poll)` est la coroutine qui l'édite.
+class PollStore:
+    def __init__(self, path, render=None, edit_interval=10.0, batch_size=500):
+        self.path = path
+        self.render = render
+        self.edit_interval = edit_interval
+        self.batch_size = batch_size
+        self.polls = {}
+        self.queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="polls")
+        self._conn = None
+        self._task = None
+        self._render_tasks = {}
+        self._last_render = {}
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def open(self):
+        if self._task is not None:
+            return self
+        for poll in await self._run(self._open):
+            self.polls[poll.id] = poll
+        self._task = asyncio.create_task(self._write_loop())
+        return self
+
+    def _open(self):
+        self._conn = connect(self.path)
+        self._conn.executescript(SCHEMA)
+        polls = {}
+        for row in self._conn.execute("SELECT * FROM polls WHERE closed = 0"):
+            polls[row["id"]] = Poll(row["id"], row["guild_id"], row["channel_id"], row["author_id"], row["title"], row["question"],
+                                    json.loads(row["options"]), row["closes_at"], row["message_id"])
+        rows = self._conn.execute("SELECT v.poll_id, v.user_id, v.option FROM poll_votes v JOIN polls p ON p.id = v.poll_id WHERE p.closed = 0")
+        for poll_id, user_id, option in rows:
+            polls[poll_id].vote(user_id, option)
+        return list(polls.values())
+
+    async def close(self):
+        if self._task is None:
+            return
+        for task in self._render_tasks.values():
+            task.cancel()
+        self.queue.put_nowait(None)
+        await self._task
+        self._task = None
+        await self._run(self._conn.close)
+        self._executor.shutdown()
+
+    def get(self, poll_id):
+        return self.polls.get(poll_id)
+
+    def pending(self):
+        return self.queue.qsize()
+
+    # ---- Modifications ----
+    def add(self, poll: Poll):
+        self.polls[poll.id] = poll
+        self.queue.put_nowait(("poll", poll.row()))
+
+    def vote(self, poll: Poll, user_id, option):
+        previous = poll.vote(user_id, option)
+        if previous != option:
+            self.queue.put_nowait(("vote", (poll.id, user_id, option)))
+            self.request_render(poll)
+        return previous
+
+    async def finish(self, poll_id):
+        # Clôture : retire le sondage de la mémoire et réédite une dernière fois
+        poll = self.polls.pop(poll_id, None)
+        if poll is None:
+            return None
+        poll.closed = True
+        task = self._render_tasks.pop(poll_id, None)
+        if task is not None:
+            task.cancel()
+        self._last_render.pop(poll_id, None)
+        self.queue.put_nowait(("poll", poll.row()))
+        if self.render is not None:
+            await self.render(poll)
+        return poll
+
+    # ---- Rendu ----
+    def request_render(self, poll: Poll):
+        if self.render is None or poll.id in self._render_tasks:
+            return
+        delay = self._last_render.get(poll.id, 0.0) + self.edit_interval - time.monotonic()
+        self._render_tasks[poll.id] = asyncio.create_task(self._render_later(poll, max(0.0, delay)))
+
+    async def _render_later(self, poll, delay):
+        await asyncio.sleep(delay)
+        # Retiré avant l'édition : un vote pendant l'appel REST planifie le rendu suivant
+        self._render_tasks.pop(poll.id, None)
+        self._last_render[poll.id] = time.monotonic()
+        try:
+            await self.render(poll)
+        except Exception:
+            log.exception("Rendu du sondage %s impossible", poll.id)
+
+    # ---- Écriture ----
+    async def _write_loop(self):
+        stop = False
+        while not stop:
+            batch = [await self.queue.get()]
+            while not self.queue.empty() and len(batch) < self.batch_size:
+                batch.append(self.queue.get_nowait())
+            if None in batch:
+                stop = True
+                batch = [op for op in batch if op is not None]
+            if not batch:
+                continue
+            try:
+                await self._run(self._write, batch)
+            except sqlite3.Error:
+                log.exception("Écriture de %d opération(s) de sondage impossible", len(batch))
+
+    def _write(self, batch):
+        with self._conn:
+            for kind, row in batch:
+                if kind == "poll":
+                    self._conn.execute("INSERT OR REPLACE INTO polls VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+                else:
+                    self._conn.execute("INSERT OR REPLACE INTO poll_votes VALUES (?, ?, ?)", row)
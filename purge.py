@@ -0,0 +1,173 @@
+import asyncio
+import dataclasses
+import logging
+import re
+import time
+from datetime import timedelta
+import discord
+from jobs import with_retry
+
+log = logging.getLogger(__name__)
+
+# Taille maximale d'une suppression groupée (limite de Discord)
+BULK_SIZE = 100
+# Discord refuse la suppression groupée au-delà de 14 jours ; marge pour les
+# messages qui franchissent la limite pendant la purge
+BULK_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+
+
+# ------------------ FILTRES ------------------
+@dataclasses.dataclass(frozen=True)
+class PurgeFilter:
+    user_id: int | None = None
+    pattern: re.Pattern | None = None
+    bots: bool = False
+    attachments: bool = False
+
+    @property
+    def active(self):
+        return self.user_id is not None or self.pattern is not None or self.bots or self.attachments
+
+    def matches(self, message: discord.Message):
+        if self.user_id is not None and message.author.id != self.user_id:
+            return False
+        if self.bots and not message.author.bot:
+            return False
+        if self.attachments and not message.attachments:
+            return False
+        return self.pattern is None or bool(self.pattern.search(message.content))
+
+    def describe(self):
+        parts = []
+        if self.user_id is not None:
+            parts.append(f"de <@{self.user_id}>")
+        if self.bots:
+            parts.append("de bots")
+        if self.attachments:
+            parts.append("avec pièce jointe")
+        if self.pattern is not None:
+            parts.append(f"correspondant à `{self.pattern.pattern}`")
+        return ", ".join(parts) or "tous"
+
+
+# ------------------ PURGE ------------------
+# L'historique est parcouru page par page pendant que les suppressions
+# avancent : les messages retenus partent par lots de 100 (un appel REST par
+# lot), les messages de plus de 14 jours passent par une file séparée,
+# supprimés un par un avec `old_interval` secondes entre deux appels. Même
+# interface que BulkJob pour report_progress.
+class PurgeJob:
+    def __init__(self, channel, limit, check: PurgeFilter, scan_limit=None, reason=None, old_interval=1.0):
+        self.name = f"Purge de #{channel.name}"
+        self.channel = channel
+        self.limit = limit
+        self.check = check
+        # Sans filtre, chaque message parcouru est supprimé
+        self.scan_limit = scan_limit if check.active else limit
+        self.reason = reason
+        self.old_interval = old_interval
+        self.scanned = 0
+        self.matched = 0
+        self.done = 0
+        self.failed = 0
+        self.old_pending = 0
+        self.started_at = None
+        self.finished_at = None
+        self.task = None
+
+    @property
+    def total(self):
+        return self.matched
+
+    @property
+    def finished(self):
+        return self.task is not None and self.task.done()
+
+    @property
+    def error(self):
+        # Exception qui a interrompu la purge (Forbidden sur l'historique...)
+        if not self.finished or self.task.cancelled():
+            return None
+        return self.task.exception()
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+        return self
+
+    async def wait(self):
+        return await self.start().task
+
+    async def run(self):
+        self.started_at = time.monotonic()
+        # Files bornées : le parcours attend si les suppressions prennent du retard
+        bulk, old = asyncio.Queue(maxsize=2), asyncio.Queue(maxsize=BULK_SIZE * 10)
+        workers = [asyncio.create_task(self._bulk_worker(bulk)), asyncio.create_task(self._old_worker(old))]
+        try:
+            await self._scan(bulk, old)
+            await bulk.put(None)
+            await old.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for w in workers:
+                w.cancel()
+            self.finished_at = time.monotonic()
+        return self
+
+    async def _scan(self, bulk, old):
+        cutoff = discord.utils.utcnow() - BULK_MAX_AGE
+        batch = []
+        async for message in self.channel.history(limit=self.scan_limit):
+            self.scanned += 1
+            if not self.check.matches(message):
+                continue
+            self.matched += 1
+            if message.created_at < cutoff:
+                self.old_pending += 1
+                await old.put(message)
+            else:
+                batch.append(message)
+                if len(batch) == BULK_SIZE:
+                    await bulk.put(batch)
+                    batch = []
+            if self.matched >= self.limit:
+                break
+        if batch:
+            await bulk.put(batch)
+
+    async def _bulk_worker(self, queue):
+        while (batch := await queue.get()) is not None:
+            try:
+                # Un seul message : discord.py bascule sur la suppression simple
+                await with_retry(lambda: self.channel.delete_messages(batch, reason=self.reason))
+                self.done += len(batch)
+            except Exception:
+                self.failed += len(batch)
+                log.exception("%s : échec d'une suppression groupée", self.name)
+
+    async def _old_worker(self, queue):
+        while (message := await queue.get()) is not None:
+            try:
+                await with_retry(lambda: message.delete())
+                self.done += 1
+            except discord.NotFound:
+                self.done += 1
+            except Exception:
+                self.failed += 1
+                log.exception("%s : échec pour le message %s", self.name, message.id)
+            self.old_pending -= 1
+            await asyncio.sleep(self.old_interval)
+
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def progress_text(self):
+        state = "⏳ En cours" if not self.finished else "❌ Interrompue" if self.error else "✅ Terminé"
+        text = f"{state} — {self.name} : {self.done} supprimé(s), {self.scanned} parcouru(s) ({self.elapsed():.1f}s)"
+        if self.old_pending:
+            text += f" | 🐢 {self.old_pending} message(s) de plus de 14 jours en attente"
+        if self.failed:
+            text += f" | ❌ {self.failed} échec(s)"
+        return text
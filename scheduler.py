@@ -0,0 +1,127 @@
+import asyncio
+import heapq
+import logging
+import time
+from storage import JsonStore
+
+log = logging.getLogger(__name__)
+
+
+# ------------------ EXPIRATIONS PLANIFIÉES ------------------
+# Une seule tâche pour toutes les sanctions temporaires : les échéances sont
+# persistées dans un JsonStore et rangées dans un tas (min-heap) en mémoire.
+# La tâche dort jusqu'à la prochaine échéance et, après une coupure, exécute
+# les actions en retard par lots de `batch_size`. Avec plusieurs processus,
+# `owns(guild_id)` limite chaque processus aux serveurs de ses shards.
+class ExpiryScheduler:
+    def __init__(self, path, batch_size=25, backend=None, owns=None):
+        self.store = JsonStore(path, backend=backend)
+        self.batch_size = batch_size
+        self.owns = owns
+        self.handlers = {}
+        self.heap = []
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def handler(self, kind):
+        # Enregistré au chargement d'une extension : les échéances de ce type
+        # laissées en attente faute de handler sont replanifiées
+        def decorator(coro):
+            self.handlers[kind] = coro
+            if self._task is not None:
+                self._requeue(kind)
+            return coro
+        return decorator
+
+    def _requeue(self, kind):
+        for key, entry in self.store.items():
+            if entry["kind"] == kind and (self.owns is None or self.owns(entry["guild"])):
+                heapq.heappush(self.heap, (entry["when"], key))
+        self._wakeup.set()
+
+    @staticmethod
+    def key(kind, guild_id, user_id):
+        return f"{kind}:{guild_id}:{user_id}"
+
+    def pending(self):
+        if self.owns is None:
+            return len(self.store)
+        return sum(1 for _, entry in self.store.items() if self.owns(entry["guild"]))
+
+    def load(self):
+        # Au démarrage, avant toute interaction : une sanction programmée avant
+        # le chargement écraserait les échéances déjà persistées
+        self.store.load()
+
+    def start(self):
+        # Lancé une fois le bot prêt : la tâche n'est lancée qu'une seule fois
+        if self._task is not None:
+            return
+        self.heap = [(entry["when"], key) for key, entry in self.store.items() if self.owns is None or self.owns(entry["guild"])]
+        heapq.heapify(self.heap)
+        self._task = asyncio.create_task(self._run())
+
+    async def schedule(self, kind, guild_id, user_id, seconds, **extra):
+        # Une nouvelle sanction du même type remplace l'échéance précédente
+        key = self.key(kind, guild_id, user_id)
+        entry = {"kind": kind, "guild": guild_id, "user": user_id, "when": time.time() + seconds, **extra}
+        await self.store.set(key, entry)
+        heapq.heappush(self.heap, (entry["when"], key))
+        if self.heap[0][1] == key:
+            self._wakeup.set()
+        return entry
+
+    async def cancel(self, kind, guild_id, user_id):
+        # Suppression paresseuse : l'entrée restée dans le tas sera ignorée
+        return await self.store.pop(self.key(kind, guild_id, user_id))
+
+    async def flush(self):
+        await self.store.flush()
+
+    def _is_current(self, when, key):
+        entry = self.store.get(key)
+        return entry is not None and entry["when"] == when
+
+    async def _run(self):
+        while True:
+            while self.heap and not self._is_current(*self.heap[0]):
+                heapq.heappop(self.heap)
+            if not self.heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            delay = self.heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            now = time.time()
+            batch = []
+            while self.heap and len(batch) < self.batch_size and self.heap[0][0] <= now:
+                when, key = heapq.heappop(self.heap)
+                if not self._is_current(when, key):
+                    continue
+                if self.store.get(key)["kind"] not in self.handlers:
+                    # Extension absente ou non chargée : l'échéance reste
+                    # enregistrée jusqu'à l'enregistrement de son handler
+                    log.warning("Aucun handler pour l'expiration %s, conservée", key)
+                    continue
+                batch.append(await self.store.pop(key))
+            results = await asyncio.gather(*(self._fire(entry) for entry in batch), return_exceptions=True)
+            for entry, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    log.error("Échec de l'expiration %s", entry, exc_info=result)
+            # Laisse respirer la boucle entre deux lots de rattrapage
+            await asyncio.sleep(0)
+
+    async def _fire(self, entry):
+        handler = self.handlers.get(entry["kind"])
+        if handler is None:
+            # Extension déchargée entre-temps : remise en attente
+            await self.store.set(self.key(entry["kind"], entry["guild"], entry["user"]), entry)
+            return
+        await handler(entry)
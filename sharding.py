@@ -0,0 +1,70 @@
+import asyncio
+import discord
+
+
+def parse_shard_ids(text):
+    # « 0-3,8,10-11 » -> [0, 1, 2, 3, 8, 10, 11] ; chaîne vide -> None (tous les shards)
+    if not text or not text.strip():
+        return None
+    ids = set()
+    for part in text.split(","):
+        start, _, end = part.strip().partition("-")
+        ids.update(range(int(start), int(end or start) + 1))
+    return sorted(ids)
+
+
+def format_shard_ids(ids):
+    # Inverse de parse_shard_ids, pour les variables d'environnement des workers
+    ranges = []
+    for shard_id in sorted(ids):
+        if ranges and ranges[-1][1] == shard_id - 1:
+            ranges[-1][1] = shard_id
+        else:
+            ranges.append([shard_id, shard_id])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def split_shards(shard_count, processes):
+    # Plages contiguës de taille égale (à un shard près), une par processus
+    size, extra = divmod(shard_count, processes)
+    ranges, start = [], 0
+    for i in range(processes):
+        end = start + size + (i < extra)
+        ranges.append(list(range(start, end)))
+        start = end
+    return [r for r in ranges if r]
+
+
+def shard_for(guild_id, shard_count):
+    # Formule de Discord : les 22 bits de poids faible de l'ID sont ignorés
+    return (int(guild_id) >> 22) % shard_count
+
+
+# ------------------ PROPRIÉTÉ DES SERVEURS ------------------
+# Avec plusieurs processus, chacun ne voit que les serveurs de ses shards :
+# les tâches liées à un serveur (fins de sanctions...) ne tournent que là.
+class ShardOwnership:
+    def __init__(self, shard_count=None, shard_ids=None):
+        self.shard_count = shard_count
+        self.shard_ids = frozenset(shard_ids) if shard_ids is not None else None
+
+    @property
+    def partial(self):
+        # Vrai si d'autres processus gèrent une partie des shards
+        return self.shard_ids is not None
+
+    def owns(self, guild_id):
+        if self.shard_ids is None:
+            return True
+        return shard_for(guild_id, self.shard_count) in self.shard_ids
+
+
+async def recommended_shards(token):
+    # Nombre de shards conseillé par Discord et nombre d'IDENTIFY simultanés autorisés
+    http = discord.http.HTTPClient(asyncio.get_running_loop())
+    try:
+        await http.static_login(token)
+        shards, _, limits = await http.get_bot_gateway()
+    finally:
+        await http.close()
+    return shards, limits.get("max_concurrency", 1)
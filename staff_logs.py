@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from collections import deque
+import discord
+from jobs import with_retry
+
+log = logging.getLogger(__name__)
+
+# Priorités des entrées : en cas de saturation, les LOW partent en premier
+LOW = 0
+NORMAL = 1
+HIGH = 2
+
+# Limites Discord par message
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+
+
+# ------------------ FILE DES STAFF LOGS ------------------
+# Une file par serveur : les appelants ne font qu'ajouter un embed, une tâche
+# par serveur attend `flush_delay` secondes puis envoie les embeds accumulés
+# par paquets de 10 par message. L'ID du salon de logs est mis en cache.
+class StaffLogQueue:
+    def __init__(self, channel_name="staff-logs", flush_delay=1.5, max_pending=200, configured_channel=None):
+        # configured_channel(guild_id) -> ID du salon choisi par le serveur, ou None
+        self.configured_channel = configured_channel
+        self.channel_name = channel_name
+        self.flush_delay = flush_delay
+        self.max_pending = max_pending
+        self.queues = {}
+        self.dropped = {}
+        self.channel_ids = {}
+        self.tasks = {}
+
+    # ---- Salon de logs ----
+    def resolve_channel(self, guild: discord.Guild):
+        if self.configured_channel is not None:
+            channel = guild.get_channel(self.configured_channel(guild.id) or 0)
+            if channel:
+                return channel
+        # None en cache = pas de salon de logs ; invalidé par les événements de salons
+        if guild.id in self.channel_ids:
+            channel_id = self.channel_ids[guild.id]
+            if channel_id is None:
+                return None
+            channel = guild.get_channel(channel_id)
+            if channel:
+                return channel
+        channel = discord.utils.get(guild.text_channels, name=self.channel_name)
+        self.channel_ids[guild.id] = channel.id if channel else None
+        return channel
+
+    def invalidate(self, guild_id):
+        self.channel_ids.pop(guild_id, None)
+
+    def depth(self):
+        return sum(len(q) for q in self.queues.values())
+
+    # ---- Ajout ----
+    def enqueue(self, guild: discord.Guild, embed: discord.Embed, priority=NORMAL):
+        if not self.resolve_channel(guild):
+            return False
+        queue = self.queues.setdefault(guild.id, deque())
+        if len(queue) >= self.max_pending:
+            self.dropped[guild.id] = self.dropped.get(guild.id, 0) + 1
+            if not self._make_room(queue, priority):
+                return False
+        queue.append((priority, embed))
+        task = self.tasks.get(guild.id)
+        if task is None or task.done():
+            self.tasks[guild.id] = asyncio.create_task(self._flush_later(guild))
+        return True
+
+    def _make_room(self, queue, priority):
+        # File pleine : retire l'entrée la plus ancienne de priorité inférieure
+        for lowest in range(priority):
+            for i, (p, _) in enumerate(queue):
+                if p == lowest:
+                    del queue[i]
+                    return True
+        return False
+
+    # ---- Envoi ----
+    async def _flush_later(self, guild):
+        await asyncio.sleep(self.flush_delay)
+        await self.flush(guild)
+
+    async def flush(self, guild):
+        queue = self.queues.get(guild.id)
+        while queue:
+            batch, size = [], 0
+            while queue and len(batch) < MAX_EMBEDS and size + len(queue[0][1]) <= MAX_EMBED_CHARS:
+                size += len(queue[0][1])
+                batch.append(queue.popleft()[1])
+            if not batch:
+                # Embed isolé trop gros : on l'envoie seul
+                batch.append(queue.popleft()[1])
+            channel = self.resolve_channel(guild)
+            if not channel:
+                queue.clear()
+                break
+            dropped = self.dropped.pop(guild.id, 0)
+            content = f"⚠️ {dropped} log(s) ignoré(s) (file saturée)" if dropped else None
+            try:
+                await with_retry(lambda: channel.send(content=content, embeds=batch))
+            except discord.HTTPException:
+                log.exception("Envoi des staff logs impossible pour %s", guild.id)
+
+    async def close(self):
+        for task in self.tasks.values():
+            task.cancel()
+        pending = self.depth()
+        if pending:
+            log.warning("%d staff log(s) non envoyé(s) à l'arrêt", pending)
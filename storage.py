@@ -0,0 +1,275 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+
+log = logging.getLogger(__name__)
+
+# Délai maximal entre deux essais d'une écriture différée en échec
+FLUSH_RETRY_MAX = 60.0
+
+
+# ------------------ FICHIERS JSON ------------------
+def load_json(file):
+    try:
+        with open(file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def atomic_write_text(file, text):
+    # Écriture dans un fichier temporaire du même dossier puis rename :
+    # un crash en pleine écriture ne laisse jamais un JSON tronqué.
+    directory = os.path.dirname(os.path.abspath(file))
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, file)
+    except BaseException:
+        try: os.unlink(tmp)
+        except FileNotFoundError: pass
+        raise
+
+
+def atomic_write_json(file, data):
+    atomic_write_text(file, json.dumps(data, indent=4))
+
+
+# ------------------ STOCKAGE ------------------
+# Marque une clé supprimée dans les changements passés au stockage
+DELETED = object()
+
+
+class JsonFile:
+    # Un fichier JSON réécrit en entier à chaque flush
+    full_snapshot = True
+
+    def __init__(self, path):
+        self.path = path
+
+    def read(self):
+        return load_json(self.path)
+
+    def write(self, snapshot, changes):
+        atomic_write_json(self.path, snapshot)
+
+
+# ------------------ SQLITE ------------------
+# Connexion commune aux bases locales (registre, sondages, transcripts) et à
+# la base partagée : WAL, lectures jamais bloquées par les écritures.
+def connect(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+SHARED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS store (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS imported (namespace TEXT PRIMARY KEY);
+"""
+
+
+class SqliteTable:
+    # Espace de noms d'une base SQLite partagée entre plusieurs processus. Seules
+    # les clés modifiées sont écrites : un processus ne réécrit jamais les
+    # lignes d'un autre. `legacy` : fichier JSON importé une seule fois.
+    full_snapshot = False
+
+    def __init__(self, db_path, namespace, legacy=None):
+        self.db_path = db_path
+        self.namespace = namespace
+        self.legacy = legacy
+
+    def read(self):
+        conn = connect(self.db_path)
+        try:
+            conn.executescript(SHARED_SCHEMA)
+            if self.legacy:
+                # BEGIN IMMEDIATE : un seul processus fait l'import
+                conn.execute("BEGIN IMMEDIATE")
+                if conn.execute("SELECT 1 FROM imported WHERE namespace = ?", (self.namespace,)).fetchone() is None:
+                    conn.executemany("INSERT OR IGNORE INTO store (namespace, key, value) VALUES (?, ?, ?)",
+                                     [(self.namespace, k, json.dumps(v)) for k, v in load_json(self.legacy).items()])
+                    conn.execute("INSERT INTO imported (namespace) VALUES (?)", (self.namespace,))
+                conn.commit()
+            rows = conn.execute("SELECT key, value FROM store WHERE namespace = ?", (self.namespace,))
+            return {key: json.loads(value) for key, value in rows}
+        finally:
+            conn.close()
+
+    def write(self, snapshot, changes):
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                conn.executemany("DELETE FROM store WHERE namespace = ? AND key = ?",
+                                 [(self.namespace, k) for k, v in changes.items() if v is DELETED])
+                conn.executemany("INSERT OR REPLACE INTO store (namespace, key, value) VALUES (?, ?, ?)",
+                                 [(self.namespace, k, json.dumps(v)) for k, v in changes.items() if v is not DELETED])
+        finally:
+            conn.close()
+
+
+# ------------------ STORE EN MÉMOIRE ------------------
+# Dictionnaire gardé en mémoire et écrit sur disque en différé : les lectures
+# ne touchent jamais le disque, et chaque modification programme une seule
+# écriture atomique après `flush_delay` secondes (hors de la boucle asyncio).
+# Les valeurs sont remplacées, jamais modifiées sur place. Par défaut le
+# stockage est un fichier JSON ; `backend` permet une table SQLite partagée.
+class JsonStore:
+    def __init__(self, path, flush_delay=1.0, backend=None):
+        self.path = path
+        self.flush_delay = flush_delay
+        self.backend = backend or JsonFile(path)
+        self.data = {}
+        self.lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._dirty = set()
+        self._flush_task = None
+
+    def load(self):
+        self.data = self.backend.read()
+        return self
+
+    def get(self, key, default=None):
+        return self.data.get(str(key), default)
+
+    def items(self):
+        return list(self.data.items())
+
+    def __contains__(self, key):
+        return str(key) in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+    async def set(self, key, value):
+        async with self.lock:
+            self.data[str(key)] = value
+            self._mark_dirty(str(key))
+
+    async def pop(self, key, default=None):
+        async with self.lock:
+            if str(key) not in self.data:
+                return default
+            value = self.data.pop(str(key))
+            self._mark_dirty(str(key))
+            return value
+
+    def _mark_dirty(self, key):
+        self._dirty.add(key)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self.flush_delay)
+        delay = self.flush_delay
+        while True:
+            try:
+                await self.flush()
+                return
+            except Exception:
+                # Base verrouillée, disque plein... : les clés restent à écrire,
+                # on réessaie sans attendre la prochaine modification
+                delay = min(max(delay * 2, 1.0), FLUSH_RETRY_MAX)
+                log.exception("Écriture de %s impossible, nouvel essai dans %.0f s", self.path, delay)
+                await asyncio.sleep(delay)
+
+    async def flush(self):
+        async with self._write_lock:
+            async with self.lock:
+                if not self._dirty:
+                    return
+                dirty, self._dirty = self._dirty, set()
+                changes = {key: self.data.get(key, DELETED) for key in dirty}
+                snapshot = dict(self.data) if self.backend.full_snapshot else None
+            try:
+                await asyncio.to_thread(self.backend.write, snapshot, changes)
+            except Exception:
+                self._dirty |= dirty
+                raise
+
+
+# ------------------ TICKETS ------------------
+# Tickets ouverts, indexés par ID de salon. Un second index par serveur garde
+# les tickets triés du plus ancien au plus récent ; les `listeners` sont
+# appelés avec (guild_id, position, ouvert) à chaque ouverture / fermeture.
+class TicketStore(JsonStore):
+    def __init__(self, path, flush_delay=1.0, backend=None):
+        super().__init__(path, flush_delay, backend)
+        self.by_guild = {}
+        self.listeners = []
+
+    def load(self):
+        super().load()
+        self._reindex()
+        return self
+
+    def _reindex(self):
+        self.by_guild = {}
+        for ch_id, info in sorted(self.data.items(), key=lambda kv: kv[1].get("opened_at", 0)):
+            self.by_guild.setdefault(info.get("guild"), {})[ch_id] = info
+
+    def for_guild(self, guild_id):
+        return self.by_guild.get(guild_id, {})
+
+    def _notify(self, guild_id, index, opened):
+        for listener in self.listeners:
+            listener(guild_id, index, opened)
+
+    async def open(self, channel_id, user_id, guild_id, logs_id):
+        info = {"user": user_id, "guild": guild_id, "logs": logs_id, "opened_at": time.time()}
+        await self.set(channel_id, info)
+        guild_tickets = self.by_guild.setdefault(guild_id, {})
+        guild_tickets[str(channel_id)] = info
+        self._notify(guild_id, len(guild_tickets) - 1, True)
+        return info
+
+    async def close(self, channel_id):
+        # Retourne None si le ticket était déjà fermé : deux clics simultanés
+        # ne peuvent pas fermer deux fois le même ticket.
+        info = await self.pop(channel_id)
+        if info is None:
+            return None
+        guild_tickets = self.by_guild.get(info.get("guild"), {})
+        if str(channel_id) in guild_tickets:
+            index = list(guild_tickets).index(str(channel_id))
+            del guild_tickets[str(channel_id)]
+            self._notify(info.get("guild"), index, False)
+        return info
+
+    async def restore(self, channel_id, info):
+        # Annule une fermeture (archivage en échec) : le ticket reprend sa
+        # place, dans l'ordre d'ouverture
+        await self.set(channel_id, info)
+        self._reindex()
+        guild_id = info.get("guild")
+        self._notify(guild_id, list(self.for_guild(guild_id)).index(str(channel_id)), True)
+
+    async def repair(self, get_channel, forget_missing=True):
+        # Anciennes entrées sans serveur : rattachées via leur salon, ou
+        # oubliées si le salon n'existe plus (sauf si un autre processus
+        # peut encore le voir : forget_missing=False)
+        for ch_id, info in self.items():
+            if info.get("guild") is not None:
+                continue
+            channel = get_channel(int(ch_id))
+            if channel:
+                await self.set(ch_id, {**info, "guild": channel.guild.id, "opened_at": info.get("opened_at", 0)})
+            elif forget_missing:
+                await self.pop(ch_id)
+        self._reindex()
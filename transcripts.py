@@ -0,0 +1,142 @@
+import asyncio
+import gzip
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import discord
+from storage import connect
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    ticket_id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER,
+    closed_by INTEGER,
+    opened_at REAL,
+    closed_at REAL NOT NULL,
+    messages INTEGER NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transcripts_guild_user ON transcripts (guild_id, user_id, closed_at);
+"""
+
+
+def serialize_message(message: discord.Message):
+    # Les pièces jointes sont gardées par référence (URL), pas téléchargées
+    return {
+        "id": message.id,
+        "author_id": message.author.id,
+        "author": str(message.author),
+        "created_at": message.created_at.isoformat(),
+        "content": message.content,
+        "attachments": [{"filename": a.filename, "url": a.url, "size": a.size, "content_type": a.content_type} for a in message.attachments],
+        "embeds": len(message.embeds),
+        "reply_to": message.reference.message_id if message.reference else None,
+    }
+
+
+def write_lines(fh, records):
+    fh.write("".join(json.dumps(r) + "\n" for r in records))
+
+
+# ------------------ ARCHIVES DE TICKETS ------------------
+# L'historique du salon est lu page par page (100 messages) et chaque page est
+# compressée dans un fichier JSONL.gz par un thread dédié, pendant que la page
+# suivante est téléchargée. La file entre les deux est bornée : la mémoire
+# reste constante, même pour des dizaines de milliers de messages.
+class TranscriptArchiver:
+    def __init__(self, directory="transcripts", page_size=100, max_pending_pages=4):
+        self.directory = directory
+        self.page_size = page_size
+        self.max_pending_pages = max_pending_pages
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transcripts")
+        self._conn = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def open(self):
+        await self._run(self._open_index)
+        return self
+
+    def _open_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._conn = connect(os.path.join(self.directory, "index.db"))
+        self._conn.executescript(INDEX_SCHEMA)
+
+    async def close(self):
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown()
+
+    # ---- Archivage ----
+    async def archive(self, channel: discord.TextChannel, info: dict, closed_by: discord.abc.User):
+        guild_dir = os.path.join(self.directory, str(channel.guild.id))
+        path = os.path.join(guild_dir, f"{channel.id}.jsonl.gz")
+        header = {"type": "ticket", "ticket_id": channel.id, "channel": channel.name, "guild_id": channel.guild.id,
+                  "user_id": info.get("user"), "opened_at": info.get("opened_at"), "closed_by": closed_by.id, "closed_at": time.time()}
+        queue = asyncio.Queue(maxsize=self.max_pending_pages)
+        writer = asyncio.create_task(self._write(guild_dir, path, header, queue))
+        count, page = 0, []
+        try:
+            async for message in channel.history(limit=None, oldest_first=True):
+                page.append(serialize_message(message))
+                if len(page) >= self.page_size:
+                    count += len(page)
+                    await self._put(queue, page, writer)
+                    page = []
+            count += len(page)
+            if page:
+                await self._put(queue, page, writer)
+            await self._put(queue, None, writer)
+            await writer
+        except BaseException:
+            writer.cancel()
+            raise
+        await self._run(self._index, header, count, path)
+        return path, count
+
+    @staticmethod
+    async def _put(queue, page, writer):
+        # Si l'écriture échoue, on ne reste pas bloqué sur une file pleine
+        put = asyncio.ensure_future(queue.put(page))
+        await asyncio.wait({put, writer}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            writer.result()
+
+    async def _write(self, guild_dir, path, header, queue):
+        tmp = path + ".part"
+        await self._run(os.makedirs, guild_dir, 0o777, True)
+        fh = await self._run(gzip.open, tmp, "wt", 6, "utf-8")
+        try:
+            await self._run(write_lines, fh, [header])
+            while (page := await queue.get()) is not None:
+                await self._run(write_lines, fh, page)
+            await self._run(fh.close)
+            await self._run(os.replace, tmp, path)
+        except BaseException:
+            await self._run(fh.close)
+            await self._run(os.remove, tmp)
+            raise
+
+    def _index(self, header, count, path):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (ticket_id, guild_id, user_id, closed_by, opened_at, closed_at, messages, path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (header["ticket_id"], header["guild_id"], header["user_id"], header["closed_by"], header["opened_at"], header["closed_at"], count, path),
+            )
+
+    # ---- Recherche ----
+    async def for_user(self, guild_id, user_id, limit=25):
+        return await self._run(self._query, "SELECT * FROM transcripts WHERE guild_id = ? AND user_id = ? ORDER BY closed_at DESC LIMIT ?", (guild_id, user_id, limit))
+
+    async def get(self, guild_id, ticket_id):
+        rows = await self._run(self._query, "SELECT * FROM transcripts WHERE guild_id = ? AND ticket_id = ?", (guild_id, ticket_id))
+        return rows[0] if rows else None
+
+    def _query(self, query, params):
+        return [dict(row) for row in self._conn.execute(query, params)]
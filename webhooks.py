@@ -0,0 +1,37 @@
+from collections import OrderedDict
+import aiohttp
+import discord
+
+
+# ------------------ SESSION HTTP & WEBHOOKS ------------------
+# Une seule session aiohttp pour toute la durée de vie du bot : les connexions
+# TCP/TLS et les résolutions DNS sont réutilisées d'un envoi à l'autre.
+# Les objets Webhook déjà parsés sont gardés dans un cache LRU par URL.
+class WebhookCache:
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self.session = None
+        self.cache = OrderedDict()
+
+    async def open(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=50, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self
+
+    async def close(self):
+        self.cache.clear()
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    def get(self, url: str) -> discord.Webhook:
+        # Lève ValueError si l'URL n'est pas une URL de webhook Discord
+        webhook = self.cache.get(url)
+        if webhook is not None:
+            self.cache.move_to_end(url)
+            return webhook
+        webhook = discord.Webhook.from_url(url, session=self.session)
+        self.cache[url] = webhook
+        if len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+        return webhook